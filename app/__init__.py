@@ -1,10 +1,45 @@
+from typing import Any, Dict, Optional
+
 from flask import Flask, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from .config import Config
 from .models import db
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional: serve uncompressed responses
+    Compress = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster response serialization."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
 
-def create_app() -> Flask:
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def warm_start(app: Flask) -> None:
+    """Load the FAISS index, retriever and agent now instead of on the first /v1/chat."""
+    from .routes import _ensure_services
+    with app.app_context():
+        _ensure_services()
+
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """Build the app; `config` overrides Config before extensions bind to it (e.g. the test DB)."""
     # Point Flask to project-level templates/static
     app = Flask(
         __name__,
@@ -12,15 +47,24 @@ def create_app() -> Flask:
         static_folder="../static",
     )
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
 
     # Extensions
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     db.init_app(app)
+    if Compress is not None:
+        Compress(app)
 
     # Blueprints
     from .routes import api_bp
     app.register_blueprint(api_bp, url_prefix="/api")
 
+    if app.config.get("WARM_START"):
+        warm_start(app)
+
     @app.route("/healthz", methods=["GET"])  # lightweight health endpoint
     def healthz():
         return {"status": "ok"}, 200
@@ -4,8 +4,13 @@ import json
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: stdlib json fallback
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ParsedAction:
     tool: str
     arguments: Dict[str, Any]
@@ -28,13 +33,15 @@ def try_parse_action(text: str) -> Optional[ParsedAction]:
         return None
     candidate = text[start : end + 1]
     try:
-        data = json.loads(candidate)
-        tool = data.get("tool")
-        arguments = data.get("arguments", {})
-        if isinstance(tool, str) and isinstance(arguments, dict):
-            return ParsedAction(tool=tool, arguments=arguments)
-    except Exception:
+        data = orjson.loads(candidate) if orjson is not None else json.loads(candidate)
+    except ValueError:  # both decoders' JSONDecodeError subclass ValueError
+        return None
+    if not isinstance(data, dict):
         return None
+    tool = data.get("tool")
+    arguments = data.get("arguments", {})
+    if isinstance(tool, str) and isinstance(arguments, dict):
+        return ParsedAction(tool=tool, arguments=arguments)
     return None
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from flask import current_app
 
@@ -26,19 +26,18 @@ class Agent:
         self.client = OllamaClient()
         self.tools = tool_registry
 
-    def build_messages(self, user: str, context: str, notes_active: bool, tool_specs: str) -> List[Dict[str, str]]:
+    def build_messages(self, user: str, context: str, notes_active: bool, tool_specs: str, history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
         sys = SYSTEM_PROMPT + f"\n\nAvailable tools: {tool_specs}"
         if notes_active:
             sys += "\nNotes are active. To add a note, ask the user to provide the note text."
-        messages = [
-            {"role": "system", "content": sys},
-            {"role": "user", "content": f"Context:\n{context}\n\nQuestion:\n{user}"},
-        ]
+        messages = [{"role": "system", "content": sys}]
+        messages.extend(history or [])
+        messages.append({"role": "user", "content": f"Context:\n{context}\n\nQuestion:\n{user}"})
         return messages
 
-    def respond(self, user: str, context: str, notes_active: bool, has_context: bool) -> Dict[str, Any]:
+    def respond(self, user: str, context: str, notes_active: bool, has_context: bool, history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
         tool_specs = self.tools.spec_for_prompt()
-        messages = self.build_messages(user, context, notes_active, tool_specs)
+        messages = self.build_messages(user, context, notes_active, tool_specs, history)
         if not has_context:
             # Force refusal path with guidance if no supporting context
             messages.append({"role": "system", "content": "No supporting context available for this query. Refuse with guidance to ingest relevant dental planning documents."})
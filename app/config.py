@@ -14,11 +14,18 @@ class Config:
     OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
     CHAT_MODEL = os.getenv("CHAT_MODEL", "llama3.1")
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+    # Ask the LLM to narrate tool actions the built-in templates don't cover
+    LLM_NARRATION = os.getenv("LLM_NARRATION", "false").lower() in ("1", "true", "yes")
 
     # Vector Store
     VECTOR_STORE = os.getenv("VECTOR_STORE", "faiss")  # faiss | qdrant (future)
+    # Build vector store / retriever / agent in create_app() rather than on first request;
+    # off by default so CLI commands and tests don't pay for it (the dev server opts in)
+    WARM_START = os.getenv("WARM_START", "false").lower() in ("1", "true", "yes")
 
     # API / App
     MAX_INPUT_CHARS = int(os.getenv("MAX_INPUT_CHARS", "8000"))
+    # Flask-Compress: gzip/br JSON responses larger than this many bytes
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
 
 
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 
 def load_json(relative_path: str) -> Dict[str, Any]:
@@ -14,11 +16,24 @@ def load_json(relative_path: str) -> Dict[str, Any]:
         return {}
 
 
-def load_config() -> Dict[str, Any]:
-    """Load all configuration files."""
-    return {
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed JSON: dicts become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=1)
+def load_config() -> Mapping[str, Any]:
+    """Load all configuration files (parsed once; DecisionRouter.reload() re-reads them).
+
+    The result is shared between callers, so it is frozen rather than handed out mutable.
+    """
+    return _freeze({
         "intent": load_json("config/intent.json"),
         "entities": load_json("config/entities.json"),
         "ranges": load_json("config/ranges.json"),
         "retrieval": load_json("config/retrieval.json")
-    }
+    })
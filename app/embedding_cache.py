@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import redis  # type: ignore
+except ImportError:  # optional: fall back to the in-process cache
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Bump with any change to the stored blob format (currently raw float64)
+_KEY_VERSION = "v2"
+_REDIS_WARN_INTERVAL_SECONDS = 60.0
+
+
+class EmbeddingCache:
+    """Memoize embeddings by model + text hash.
+
+    Uses Redis (shared across workers) when REDIS_URL is set and the client
+    is installed; otherwise a bounded in-process LRU. Vectors are stored as
+    float64 so a hit returns exactly what the model returned on the miss.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = 24 * 3600, max_local: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_local = max_local
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_warned_at: Optional[float] = None
+        url = redis_url or os.getenv("REDIS_URL")
+        if url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(url, decode_responses=False)
+            except Exception as e:
+                logger.warning("Redis embedding cache unavailable: %s", e)
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return f"emb:{_KEY_VERSION}:{model}:{digest}"
+
+    def _warn_redis(self, action: str, error: Exception) -> None:
+        """Log a failed Redis call, at most once per interval so a dead server can't flood the log."""
+        now = time.monotonic()
+        if self._redis_warned_at is None or now - self._redis_warned_at >= _REDIS_WARN_INTERVAL_SECONDS:
+            self._redis_warned_at = now
+            logger.warning("Redis embedding cache %s failed: %s", action, error)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = self._key(model, text)
+        raw: Optional[bytes] = None
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(key)
+            except Exception as e:
+                self._warn_redis("get", e)
+                raw = None
+        if raw is None:
+            with self._lock:
+                raw = self._local.get(key)
+                if raw is not None:
+                    self._local.move_to_end(key)
+        if raw is None:
+            return None
+        return np.frombuffer(raw, dtype=np.float64).tolist()
+
+    def put(self, model: str, text: str, vec: List[float]) -> None:
+        key = self._key(model, text)
+        raw = np.asarray(vec, dtype=np.float64).tobytes()
+        if self._redis is not None:
+            try:
+                self._redis.set(key, raw, ex=self.ttl_seconds)
+                return
+            except Exception as e:
+                self._warn_redis("set", e)
+        with self._lock:
+            self._local[key] = raw
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+# Global instance
+embedding_cache = EmbeddingCache()
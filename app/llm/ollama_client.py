@@ -8,6 +8,8 @@ from requests.adapters import HTTPAdapter, Retry
 from flask import current_app
 import os
 
+from ..embedding_cache import embedding_cache
+
 
 class OllamaClient:
     def __init__(self, base_url: Optional[str] = None, timeout_seconds: int = 60) -> None:
@@ -47,8 +49,11 @@ class OllamaClient:
             model_name = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
         url = f"{self.base_url}/api/embeddings"
 
-        results: List[List[float]] = []
-        for t in texts:
+        # Serve repeats from the embedding cache; only embed the misses
+        results: List[Optional[List[float]]] = [embedding_cache.get(model_name, t) for t in texts]
+        for i, t in enumerate(texts):
+            if results[i] is not None:
+                continue
             # Ollama expects a single string in "prompt"; batch client-side
             payload = {"model": model_name, "prompt": t}
             resp = self.session.post(url, json=payload, timeout=self.timeout_seconds)
@@ -57,8 +62,9 @@ class OllamaClient:
             vec = data.get("embedding") or (data.get("embeddings") and data.get("embeddings")[0])
             if not isinstance(vec, list):
                 raise ValueError("Unexpected embeddings response from Ollama")
-            results.append(vec)
-        return results
+            embedding_cache.put(model_name, t, vec)
+            results[i] = vec
+        return results  # type: ignore[return-value]
 
     def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> str:
         model_name = model
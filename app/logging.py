@@ -1,12 +1,35 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import queue
+import threading
 from datetime import datetime
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 from app.config_loader import load_config
 
 
+# Records waiting for the writer thread; beyond this they are dropped, not buffered
+_LOG_QUEUE_MAX = 10_000
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records (and counts them) when the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # handle() holds the handler lock here, so the count can't race
+            self.dropped += 1
+
+
 class ConfidenceLogger:
     """Log low-confidence cases and clarifications for evaluation."""
     
@@ -14,12 +37,23 @@ class ConfidenceLogger:
         self.logger = logging.getLogger("confidence")
         self.logger.setLevel(logging.INFO)
         
-        # Create file handler if not exists
+        # Create file handler if not exists. Records go through a queue and are
+        # written by a background listener thread, keeping file I/O off the request path.
+        # The queue is bounded so a stalled file can't grow memory without limit.
         if not self.logger.handlers:
             handler = logging.FileHandler("logs/confidence.log")
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
             handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=_LOG_QUEUE_MAX)
+            self._listener = QueueListener(log_queue, handler, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)  # flush pending records on shutdown
+            self.logger.addHandler(DroppingQueueHandler(log_queue))
+    
+    @property
+    def dropped_records(self) -> int:
+        """Records dropped because the write queue was full."""
+        return sum(getattr(handler, "dropped", 0) for handler in self.logger.handlers)
     
     def log_low_confidence(self, text: str, intent_conf: float, entity_conf: float, 
                           value_conf: float, response_type: str):
@@ -68,5 +102,23 @@ class ConfidenceLogger:
         }))
 
 
-# Global instance
-confidence_logger = ConfidenceLogger()
+# Global instance, built on first get_confidence_logger() call, so the log file
+# and listener thread only appear once something actually logs
+_confidence_logger: Optional[ConfidenceLogger] = None
+_confidence_logger_lock = threading.Lock()
+
+
+def get_confidence_logger() -> ConfidenceLogger:
+    global _confidence_logger
+    if _confidence_logger is None:
+        with _confidence_logger_lock:
+            if _confidence_logger is None:
+                _confidence_logger = ConfidenceLogger()
+    return _confidence_logger
+
+
+def __getattr__(name: str):
+    # Keeps `from ... import confidence_logger` working for scripts; that import builds it
+    if name == "confidence_logger":
+        return get_confidence_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterable, List
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 
 from ..models import db, Note, Session
 
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
 
 class NotesManager:
     def start(self, session_id: str) -> None:
-        sess = Session.query.get(session_id)
-        if not sess:
-            sess = Session(id=session_id)
-            db.session.add(sess)
+        dialect_insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+        if dialect_insert is not None:
+            # One idempotent statement instead of SELECT then INSERT
+            db.session.execute(dialect_insert(Session).values(id=session_id).on_conflict_do_nothing(index_elements=["id"]))
+        elif db.session.get(Session, session_id) is None:
+            db.session.add(Session(id=session_id))
         # no explicit state column; active is inferred by presence of non-finalized notes
         db.session.commit()
 
@@ -20,10 +28,31 @@ class NotesManager:
         db.session.commit()
         return note
 
+    def add_many(self, session_id: str, texts: Iterable[str]) -> List[Note]:
+        rows = [{"session_id": session_id, "text": text, "finalized": False} for text in texts]
+        if not rows:
+            return []
+        if db.session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            # One executemany INSERT instead of a flush per note; rows come back in input order
+            stmt = insert(Note).returning(Note, sort_by_parameter_order=True)
+            notes = db.session.scalars(stmt, rows).all()
+        else:
+            # No RETURNING (e.g. MySQL): let the unit of work batch the inserts
+            notes = [Note(**row) for row in rows]
+            db.session.add_all(notes)
+        db.session.commit()
+        return notes
+
     def end(self, session_id: str) -> List[Note]:
-        notes = Note.query.filter_by(session_id=session_id, finalized=False).all()
-        for n in notes:
-            n.finalized = True
+        pending = (Note.session_id == session_id, Note.finalized.is_(False))
+        if db.session.get_bind().dialect.update_returning:
+            # Single UPDATE ... RETURNING rather than loading every note and flushing one UPDATE each
+            notes = db.session.scalars(update(Note).where(*pending).values(finalized=True).returning(Note)).all()
+        else:
+            # One SELECT for the notes being closed, then one bulk UPDATE of exactly those rows
+            notes = db.session.scalars(select(Note).where(*pending)).all()
+            if notes:
+                db.session.execute(update(Note).where(Note.id.in_([n.id for n in notes])).values(finalized=True))
         db.session.commit()
         return notes
 
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import threading
+import time
 import uuid
-from typing import Any, Dict
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Tuple
 
-from flask import Blueprint, request
+from flask import Blueprint, current_app, g, request
+from sqlalchemy import select
 
 from .schemas import ChatRequest, IngestRequest, NotesAddRequest, NotesEndRequest, NotesStartRequest, validate_response, validate_control_arguments
-from .scene.router import decision_router
-from .models import db, Chunk, Document
+from .scene.router import get_decision_router, reload_config
+from .models import db, Chunk, Document, Note
 from .rag.chunker import split_text
 from .llm.ollama_client import OllamaClient
 from .rag.faiss_store import FAISSVectorStore
@@ -16,6 +20,7 @@ from .tools.registry import ToolRegistry
 from .tools.activate import tool_spec as activate_tool_spec
 from .tools.control import tool_spec as control_tool_spec
 from .agent.planner import Agent
+from .notes.manager import NotesManager
 
 
 api_bp = Blueprint("api", __name__)
@@ -26,11 +31,27 @@ def api_ping():
     return {"status": "ok", "service": "agentic-rag", "version": 1}, 200
 
 
+@api_bp.post("/v1/cache/clear")
+def api_cache_clear():
+    """Re-read config/*.json and drop memoized results, so edited label prompts or entities take effect."""
+    reload_config()
+    return {"ok": True}, 200
+
+
 # Initialize singletons lazily
 _vector_store: FAISSVectorStore | None = None
 _retriever: Retriever | None = None
 _agent: Agent | None = None
 _tools: ToolRegistry | None = None
+_llm: OllamaClient | None = None
+
+
+def _llm_client() -> OllamaClient:
+    """Shared Ollama client so its HTTP session (and pooled connections) is reused."""
+    global _llm
+    if _llm is None:
+        _llm = OllamaClient()
+    return _llm
 
 
 def _ensure_services() -> None:
@@ -50,6 +71,57 @@ def _ensure_services() -> None:
         _agent = Agent(_tools)
 
 
+# Per-session conversation turns kept server-side so clients only send the new message
+_HISTORY_MAX_MESSAGES = 32
+# Idle sessions are forgotten after this long, and at most this many are kept
+_HISTORY_TTL_SECONDS = 3600.0
+_HISTORY_MAX_SESSIONS = 10_000
+# session id -> (last used, turns), least recently used first
+_session_history: "OrderedDict[str, Tuple[float, Deque[Dict[str, str]]]]" = OrderedDict()
+_session_history_lock = threading.Lock()
+
+
+def _history_for(session_id: str) -> Deque[Dict[str, str]]:
+    """The session's turn buffer, evicting idle and overflow sessions along the way."""
+    now = time.monotonic()
+    with _session_history_lock:
+        entry = _session_history.pop(session_id, None)
+        if entry is not None and now - entry[0] < _HISTORY_TTL_SECONDS:
+            history = entry[1]
+        else:
+            history = deque(maxlen=_HISTORY_MAX_MESSAGES)
+        # Oldest entries sit at the front, so the sweep stops at the first live one
+        while _session_history:
+            last_used = next(iter(_session_history.values()))[0]
+            if now - last_used < _HISTORY_TTL_SECONDS and len(_session_history) < _HISTORY_MAX_SESSIONS:
+                break
+            _session_history.popitem(last=False)
+        _session_history[session_id] = (now, history)
+    return history
+
+
+_HISTORY_ROLES = frozenset({"user", "assistant"})
+
+
+def _client_history(turns: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Keep only plain user/assistant turns from a client transcript, newest last."""
+    clean = [
+        {"role": turn["role"], "content": turn["content"]}
+        for turn in turns
+        if isinstance(turn, dict) and turn.get("role") in _HISTORY_ROLES and isinstance(turn.get("content"), str)
+    ]
+    return clean[-_HISTORY_MAX_MESSAGES:]
+
+
+def _reply_text(out: Dict[str, Any]) -> str:
+    """Best-effort text of a chat response for the history buffer."""
+    for key in ("answer", "text", "narration", "message"):
+        value = out.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return ""
+
+
 @api_bp.post("/v1/ingest")
 def ingest():
     _ensure_services()
@@ -60,8 +132,7 @@ def ingest():
     chunks = split_text(data.payload)
 
     # Persist chunk texts in DB; embeddings go to vector store
-    client = OllamaClient()
-    embeddings = client.embed(chunks)
+    embeddings = _llm_client().embed(chunks)
     ids = []
     metadatas = []
     for idx, text in enumerate(chunks):
@@ -77,45 +148,105 @@ def ingest():
     return {"ok": True, "documentId": doc_id, "chunks": len(chunks)}, 200
 
 
+_NARRATION_TMPL = (
+    "You are a concise assistant in a VR dental planning app.\n"
+    "Given the action that will be performed, produce ONE short confirmation line to the user.\n"
+    "Be clear and natural; do not add extra explanations.\n\n"
+    "User message: {msg}\n"
+    "Action: {action}\n\n"
+    "Reply with one sentence only."
+)
+
+
+def _template_narration(operation: Any, target: str, value: Any) -> str | None:
+    """Return a confirmation line for common set/toggle actions, or None if not covered."""
+    if operation == "set" and isinstance(value, str) and value in {"on", "off"}:
+        return f"The {target} is now {value}."
+    if operation == "set" and isinstance(value, (int, float)):
+        return f"Setting {target} to {value}."
+    if operation == "toggle":
+        return f"Toggling {target}."
+    return None
+
+
+def _narrate(arguments: Dict[str, Any], user_message: str) -> str | None:
+    """Narrate a control action: template first, LLM only for uncovered combinations."""
+    target = str(arguments.get("target") or "target").replace("_", " ")
+    operation = arguments.get("operation")
+    value = arguments.get("value")
+    narration = _template_narration(operation, target, value)
+    if narration is None and current_app.config.get("LLM_NARRATION", False):
+        try:
+            client = _llm_client()
+            action_desc = f"operation='{operation}', target='{target}', value='{value}'"
+            prompt = _NARRATION_TMPL.format(msg=user_message, action=action_desc)
+            narration = client.chat([{"role": "user", "content": prompt}]).strip() or None
+        except Exception:
+            narration = None
+    return narration
+
+
+def _chunk_texts(chunk_ids: List[str]) -> Dict[str, str]:
+    """Map chunk id -> text, loading only the two needed columns.
+
+    Results are memoized on flask.g so repeated fallbacks within one request
+    don't query the same chunks twice.
+    """
+    cache: Dict[str, str] = g.setdefault("_chunk_text_cache", {})
+    missing = [cid for cid in chunk_ids if cid and cid not in cache]
+    if missing:
+        rows = db.session.execute(select(Chunk.id, Chunk.text).where(Chunk.id.in_(missing))).all()
+        cache.update((cid, text) for cid, text in rows)
+    return {cid: cache[cid] for cid in chunk_ids if cid in cache}
+
+
+def _rag_respond(message: str, session_id: str, history: List[Dict[str, str]]) -> tuple[Dict[str, Any], bool]:
+    """Answer via retrieval + agent. Returns (agent output, whether any context was found)."""
+    assert _retriever is not None and _vector_store is not None and _agent is not None
+    retrieved = _retriever.retrieve(message, k=6)
+    context = ""
+    if retrieved:
+        chunk_ids = [meta.get("chunk_id") for _, _, meta in retrieved]
+        context = _retriever.build_context(message, retrieved, _chunk_texts(chunk_ids))
+    has_context = bool(context.strip())
+
+    notes_active = db.session.query(Note.id).filter_by(session_id=session_id, finalized=False).first() is not None
+    out = _agent.respond(message, context, notes_active, has_context, history=history)
+    return out, has_context
+
+
 @api_bp.post("/v1/chat")
 def chat():
     _ensure_services()
     req = ChatRequest(**request.get_json(force=True))
 
+    session_history = _history_for(req.sessionId)
+    if not session_history and req.conversation_history:
+        # Bootstrap a new session from a client-supplied transcript
+        session_history.extend(_client_history(req.conversation_history))
+    out, status = _chat(req, list(session_history))
+    session_history.append({"role": "user", "content": req.message})
+    reply = _reply_text(out)
+    if reply:
+        session_history.append({"role": "assistant", "content": reply})
+    return out, status
+
+
+def _chat(req: ChatRequest, history: List[Dict[str, str]]) -> tuple[Dict[str, Any], int]:
     # Use new decision router for intelligent routing
-    router_response = decision_router.route(req.message)
+    router_response = get_decision_router().route(req.message)
     
     # Validate response using Pydantic schemas
     validated_response = validate_response(router_response)
     
     if "error" in validated_response:
         # Fallback to RAG if validation fails
-        assert _retriever is not None and _vector_store is not None and _agent is not None
-        retrieved = _retriever.retrieve(req.message, k=6)
-        chunk_ids = [meta.get("chunk_id") for _, _, meta in retrieved]
-        rows = Chunk.query.filter(Chunk.id.in_(chunk_ids)).all() if chunk_ids else []
-        lookup = {c.id: c.text for c in rows}
-        context = _retriever.build_context(req.message, retrieved, lookup)
-        has_context = len(context.strip()) > 0
-        
-        from .models import Note
-        notes_active = db.session.query(Note.id).filter_by(session_id=req.sessionId, finalized=False).first() is not None
-        out = _agent.respond(req.message, context, notes_active, has_context)
+        out, _ = _rag_respond(req.message, req.sessionId, history)
         return out, 200
     
     # If router asks for clarification, try answering via RAG automatically using available context
     if validated_response.get("type") == "clarification":
-        assert _retriever is not None and _vector_store is not None and _agent is not None
-        retrieved = _retriever.retrieve(req.message, k=6)
-        chunk_ids = [meta.get("chunk_id") for _, _, meta in retrieved]
-        rows = Chunk.query.filter(Chunk.id.in_(chunk_ids)).all() if chunk_ids else []
-        lookup = {c.id: c.text for c in rows}
-        context = _retriever.build_context(req.message, retrieved, lookup)
-        has_context = len(context.strip()) > 0
-        
-        from .models import Note
-        notes_active = db.session.query(Note.id).filter_by(session_id=req.sessionId, finalized=False).first() is not None
-        out = _agent.respond(req.message, context, notes_active, has_context)
+        out, has_context = _rag_respond(req.message, req.sessionId, history)
         # If no useful context, return a clear LLM-style apology/intent and include original clarifications
         if not has_context:
             return {
@@ -131,17 +262,8 @@ def chat():
         args = validated_response.get("arguments") or {}
         arg_check = validate_control_arguments(args)
         if "error" in arg_check:
-            assert _retriever is not None and _vector_store is not None and _agent is not None
             # Friendly preamble then try to answer via RAG
-            retrieved = _retriever.retrieve(req.message, k=6)
-            chunk_ids = [meta.get("chunk_id") for _, _, meta in retrieved]
-            rows = Chunk.query.filter(Chunk.id.in_(chunk_ids)).all() if chunk_ids else []
-            lookup = {c.id: c.text for c in rows}
-            context = _retriever.build_context(req.message, retrieved, lookup)
-            has_context = len(context.strip()) > 0
-            from .models import Note
-            notes_active = db.session.query(Note.id).filter_by(session_id=req.sessionId, finalized=False).first() is not None
-            out = _agent.respond(req.message, context, notes_active, has_context)
+            out, has_context = _rag_respond(req.message, req.sessionId, history)
             if not has_context:
                 # Polite, natural reply with guidance
                 target = args.get("target") or "this"
@@ -155,41 +277,9 @@ def chat():
                     "confidence": {"intent": 0.7, "entity": 0.3, "value": 0.2}
                 }, 200
             return out, 200
-    
-    # Add natural-language narration for successful tool actions
-    if validated_response.get("type") == "tool_action":
-        args = (validated_response.get("arguments") or {}).copy()
-        target = str(args.get("target") or "target").replace("_", " ")
-        operation = args.get("operation")
-        value = args.get("value")
-        # Try LLM-based acknowledgement first; fall back to template
-        narration = None
-        try:
-            client = OllamaClient()
-            action_desc = (
-                f"operation='{operation}', target='{target}', value='{value}'"
-            )
-            prompt = (
-                "You are a concise assistant in a VR dental planning app.\n"
-                "Given the action that will be performed, produce ONE short confirmation line to the user.\n"
-                "Be clear and natural; do not add extra explanations.\n\n"
-                f"User message: {req.message}\n"
-                f"Action: {action_desc}\n\n"
-                "Reply with one sentence only."
-            )
-            narration = client.chat(prompt).strip()
-        except Exception:
-            narration = None
-
-        if not narration:
-            # Template fallback
-            if operation == "set" and isinstance(value, str) and value in {"on", "off"}:
-                narration = f"The {target} is now {value}."
-            elif operation == "set" and isinstance(value, (int, float)):
-                narration = f"Setting {target} to {value}."
-            elif operation == "toggle":
-                narration = f"Toggling {target}."
 
+        # Add natural-language narration for successful tool actions
+        narration = _narrate(args, req.message)
         if narration:
             enriched = dict(validated_response)
             enriched["narration"] = narration
@@ -198,8 +288,6 @@ def chat():
     return validated_response, 200
 
 
-from .notes.manager import NotesManager
-
 _notes = NotesManager()
 
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import contextlib
+from typing import List, Optional, Sequence
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # optional: callers fall back to per-phrase substring checks
+    ahocorasick = None
+
+
+def no_grad():
+    """torch.inference_mode() when torch is importable, else a no-op context."""
+    try:
+        import torch
+    except ImportError:
+        return contextlib.nullcontext()
+    return torch.inference_mode()
+
+
+def phrase_automaton(phrases: Sequence[str]):
+    """Aho-Corasick automaton mapping each phrase to its index, or None without pyahocorasick."""
+    if ahocorasick is None or not phrases:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, phrase in enumerate(phrases):
+        automaton.add_word(phrase, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+def matched_ranks(automaton, phrases: Sequence[str], text: str) -> List[int]:
+    """Indices of the phrases contained in text, ascending; one automaton pass when available."""
+    if automaton is None:
+        return [rank for rank, phrase in enumerate(phrases) if phrase in text]
+    return sorted({rank for _, rank in automaton.iter(text)})
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class MicroBatcher(Generic[T]):
+    """Coalesce concurrent single-item calls into one batch call.
+
+    Callers submit() an item and wait on the returned Future. A daemon worker
+    takes everything already queued (up to `max_batch`); if that is more than one
+    item it keeps collecting for up to `window_seconds`, then runs `batch_fn` once
+    on the lot and fans the results back out. A lone item is not delayed.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], List[T]], max_batch: int = 8, window_seconds: float = 0.02) -> None:
+        self._batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: str) -> "Future[T]":
+        self._ensure_worker()
+        future: "Future[T]" = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                worker.start()
+                self._worker = worker
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        # Take whatever is already waiting; a lone item runs at once rather than
+        # paying the window, which only applies while others are arriving
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if len(batch) == 1:
+            return batch
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self._batch_fn([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"batch function returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 import numpy as np
 from typing import Any, Dict, List, Tuple, Optional
 from app.config_loader import load_config
+from app.scene.accel import no_grad
+from app.scene.batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers release that added the backend= argument (ONNX / OpenVINO)
+_MIN_ST_BACKEND_VERSION = (3, 2)
+
+# After a failed model load (e.g. the download timed out), wait this long before trying again
+_LOAD_RETRY_SECONDS = 60.0
 
 
 class ZeroShotClassifier:
@@ -16,6 +30,18 @@ class ZeroShotClassifier:
         self._label_names = None
         self._label_texts = None
         self._label_embeddings = None
+        # None until a model load succeeds (False) or can never succeed (True):
+        # classifier disabled in config, or sentence-transformers missing
+        self._disabled: Optional[bool] = None
+        self._retry_at = 0.0
+        self._load_lock = threading.Lock()
+        # Per-thread similarity scratch buffers, reused across _score() calls
+        self._sims_local = threading.local()
+        # Set when intent.classifier.batch_window_ms is configured
+        self._batcher: Optional[MicroBatcher] = None
+        self._memo: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memo_max = 2048
+        self._memo_lock = threading.Lock()
         
     def _get_config(self) -> Dict[str, Any]:
         """Load classifier config."""
@@ -35,20 +61,39 @@ class ZeroShotClassifier:
             return
             
         try:
+            import sentence_transformers
             from sentence_transformers import SentenceTransformer
             model_name = config.get("model", "all-MiniLM-L6-v2")
-            self._model = SentenceTransformer(model_name)
+            # "onnx"/"openvino" run the same model through ONNX Runtime or OpenVINO
+            # (sentence-transformers >= 3.2 with the optimum extras); "model_file"
+            # picks a pre-exported variant such as onnx/model_qint8_avx512_vnni.onnx
+            backend = config.get("backend", "torch")
+            if backend != "torch" and not self._supports_backend(sentence_transformers.__version__):
+                logger.error(
+                    "intent.classifier.backend=%r needs sentence-transformers>=%s (installed: %s); using the torch backend",
+                    backend, ".".join(map(str, _MIN_ST_BACKEND_VERSION)), sentence_transformers.__version__,
+                )
+                backend = "torch"
+            if backend == "torch":
+                if config.get("threads"):
+                    # Short single queries gain little from torch's default per-core pool
+                    import torch
+                    torch.set_num_threads(int(config["threads"]))
+                self._model = SentenceTransformer(model_name)
+            else:
+                model_kwargs = {"file_name": config["model_file"]} if config.get("model_file") else None
+                self._model = SentenceTransformer(model_name, backend=backend, model_kwargs=model_kwargs)
             
             # Load label prompts and create embeddings
             label_prompts = config.get("label_prompts", {})
             self._label_names = list(label_prompts.keys())
             self._label_texts = [label_prompts[k] for k in self._label_names]
             
-            # Create normalized embeddings for cosine similarity
-            self._label_embeddings = self._model.encode(
-                self._label_texts, 
-                normalize_embeddings=True
-            )
+            # Create normalized embeddings for cosine similarity; float32 C-order so
+            # the per-query matrix-vector product goes straight to BLAS sgemv
+            with no_grad():
+                label_embeddings = self._model.encode(self._label_texts, normalize_embeddings=False)
+            self._label_embeddings = self._normalize_rows(np.ascontiguousarray(label_embeddings, dtype=np.float32))
             
             self._enabled = True
             print(f"Loaded semantic classifier with {len(self._label_names)} labels")
@@ -56,46 +101,159 @@ class ZeroShotClassifier:
         except ImportError:
             print("Warning: sentence-transformers not installed. Semantic classifier disabled.")
             self._enabled = False
+            self._model = None
+            self._disabled = True
         except Exception as e:
             print(f"Warning: Failed to load semantic classifier: {e}")
             self._enabled = False
+            # Drop a half-initialized model so the next attempt starts over
+            self._model = None
+    
+    @staticmethod
+    def _supports_backend(version: str) -> bool:
+        try:
+            major, minor = (int(part) for part in version.split(".")[:2])
+        except ValueError:
+            return False
+        return (major, minor) >= _MIN_ST_BACKEND_VERSION
+    
+    def _ready(self) -> bool:
+        if self._disabled is not None:
+            return not self._disabled
+        if time.monotonic() < self._retry_at:
+            return False
+        # One loader at a time; concurrent first requests wait rather than load twice
+        with self._load_lock:
+            if self._disabled is None:
+                self._ensure_model()
+                if self._enabled and self._model is not None:
+                    window_ms = self._get_config().get("batch_window_ms")
+                    if not window_ms:
+                        self._batcher = None
+                    elif self._batcher is None:
+                        self._batcher = MicroBatcher(self._score, max_batch=16, window_seconds=window_ms / 1000.0)
+                    else:
+                        # Reloaded config: keep the running worker, adopt the new window
+                        self._batcher.window_seconds = window_ms / 1000.0
+                    self._disabled = False
+                elif not self._get_config().get("enabled", False):
+                    self._disabled = True
+                elif self._disabled is None:
+                    self._retry_at = time.monotonic() + _LOAD_RETRY_SECONDS
+        return self._disabled is False
+    
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        # The default model is uncased and whitespace-tokenized, so classify the
+        # normalized text and let repeats of the same words share one memo slot
+        return " ".join(text.lower().split())
+    
+    def _memo_get(self, text: str) -> Optional[Tuple[str, float]]:
+        with self._memo_lock:
+            cached = self._memo.get(text)
+            if cached is not None:
+                self._memo.move_to_end(text)
+            return cached
     
     def classify(self, text: str) -> Tuple[str, float]:
         """
         Classify text intent using semantic similarity.
         Returns (label, confidence) or ("none", 0.0) if disabled/failed.
         """
-        config = self._get_config()
-        if not config.get("enabled", False):
+        if not self._ready():
             return "none", 0.0
-            
-        self._ensure_model()
         
-        if not self._enabled or self._model is None:
-            return "none", 0.0
-            
+        text = self._normalize_text(text)
+        cached = self._memo_get(text)
+        if cached is not None:
+            return cached
+        if self._batcher is not None:
+            # Concurrent requests within the window share one encode call
+            return self._batcher.submit(text).result()
+        return self._score([text])[0]
+    
+    def classify_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """classify() for several texts at once; uncached ones are encoded as one batch."""
+        if not self._ready():
+            return [("none", 0.0)] * len(texts)
+        
+        keys = [self._normalize_text(text) for text in texts]
+        results = [self._memo_get(key) for key in keys]
+        misses = list(dict.fromkeys(key for key, result in zip(keys, results) if result is None))
+        if misses:
+            scored = dict(zip(misses, self._score(misses)))
+            results = [scored[key] if result is None else result for key, result in zip(keys, results)]
+        return results
+    
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize each row in place with a single vdot per row."""
+        for row in vectors:
+            norm = np.sqrt(np.vdot(row, row))
+            if norm > 0:
+                row /= norm
+        return vectors
+    
+    def _sims_buffer(self, rows: int) -> np.ndarray:
+        """A (rows, labels) float32 scratch array owned by the calling thread."""
+        labels = self._label_embeddings.shape[0]
+        buf = getattr(self._sims_local, "buf", None)
+        if buf is None or buf.shape[0] < rows or buf.shape[1] != labels:
+            buf = self._sims_local.buf = np.empty((rows, labels), dtype=np.float32)
+        return buf[:rows]
+    
+    def _score(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Encode normalized texts in one batch and memoize their best labels."""
         try:
-            # Encode input text with normalization
-            query_embedding = self._model.encode([text], normalize_embeddings=True)[0]
+            # Normalize the query vectors here in one pass rather than having
+            # encode() do it through the library's batched path
+            with no_grad():
+                query_embeddings = self._model.encode(texts, normalize_embeddings=False).astype(np.float32, copy=False)
+            self._normalize_rows(query_embeddings)
             
             # Compute cosine similarities (since embeddings are normalized)
-            similarities = np.dot(self._label_embeddings, query_embedding)
+            similarities = np.dot(query_embeddings, self._label_embeddings.T, out=self._sims_buffer(len(texts)))
             
-            # Get best match
-            best_idx = int(np.argmax(similarities))
-            best_label = self._label_names[best_idx]
-            best_confidence = float(similarities[best_idx])
+            # Get best match per text
+            best_indices = similarities.argmax(axis=1)
+            best_confidences = similarities[np.arange(len(texts)), best_indices].tolist()
             
             # Apply minimum confidence threshold
             min_confidence = 0.3
-            if best_confidence < min_confidence:
-                return "none", best_confidence
-                
-            return best_label, best_confidence
+            results = [
+                ("none", confidence) if confidence < min_confidence else (self._label_names[idx], confidence)
+                for idx, confidence in zip(best_indices.tolist(), best_confidences)
+            ]
             
         except Exception as e:
             print(f"Warning: Classification failed: {e}")
-            return "none", 0.0
+            return [("none", 0.0)] * len(texts)
+        
+        with self._memo_lock:
+            for text, result in zip(texts, results):
+                self._memo[text] = result
+                self._memo.move_to_end(text)
+            while len(self._memo) > self._memo_max:
+                self._memo.popitem(last=False)
+        return results
+    
+    def reload(self):
+        """Drop the cached config, model and label embeddings; the next classify() reloads them."""
+        with self._load_lock:
+            self._config = None
+            self._enabled = False
+            self._model = None
+            self._label_names = None
+            self._label_texts = None
+            self._label_embeddings = None
+            self._disabled = None
+            self._retry_at = 0.0
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """Forget memoized classify() results."""
+        with self._memo_lock:
+            self._memo.clear()
     
     def is_enabled(self) -> bool:
         """Check if classifier is enabled and loaded."""
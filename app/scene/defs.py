@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterator, Optional
+
+from .accel import matched_ranks, phrase_automaton
 
 # Canonical term -> concise definition suitable for UI/voice
 TERM_DEFINITIONS = {
@@ -40,24 +42,38 @@ SYNONYM_TO_TERM = {
 }
 
 
+# Only trigger on definition intents to avoid overfiring
+_DEFINITION_CUES = ("what is", "what are", "explain", "definition of", "tell me about")
+
+# Friendly names for terms whose key doesn't read well aloud
+_FRIENDLY_NAMES = {
+    "xray_flashlight": "X‑ray flashlight",
+    "show_nerve": "nerve overlay",
+    "show_sinus": "sinus overlay",
+    "align_implants": "align implants",
+}
+
+# Longest synonym wins; sorted once here instead of on every call
+_SORTED_SYNONYMS = tuple(sorted(SYNONYM_TO_TERM, key=len, reverse=True))
+
+
+_SYNONYM_AUTOMATON = phrase_automaton(_SORTED_SYNONYMS)
+
+
+def _matched_synonyms(q: str) -> Iterator[str]:
+    """Synonyms contained in q, longest first."""
+    # Ranks order the hits like _SORTED_SYNONYMS
+    return (_SORTED_SYNONYMS[rank] for rank in matched_ranks(_SYNONYM_AUTOMATON, _SORTED_SYNONYMS, q))
+
+
 def resolve_definition(question: str) -> Optional[str]:
     q = question.strip().lower()
-    # Only trigger on definition intents to avoid overfiring
-    if not any(x in q for x in ["what is", "what are", "explain", "definition of", "tell me about"]):
+    if not any(x in q for x in _DEFINITION_CUES):
         return None
-    for syn in sorted(SYNONYM_TO_TERM.keys(), key=len, reverse=True):
-        if syn in q:
-            term = SYNONYM_TO_TERM[syn]
-            desc = TERM_DEFINITIONS.get(term)
-            if desc:
-                # Friendly name
-                name = {
-                    "xray_flashlight": "X‑ray flashlight",
-                    "show_nerve": "nerve overlay",
-                    "show_sinus": "sinus overlay",
-                    "align_implants": "align implants",
-                }.get(term, syn)
-                return f"{name}: {desc}"
+    for syn in _matched_synonyms(q):
+        term = SYNONYM_TO_TERM[syn]
+        desc = TERM_DEFINITIONS.get(term)
+        if desc:
+            name = _FRIENDLY_NAMES.get(term, syn)
+            return f"{name}: {desc}"
     return None
-
-
@@ -1,8 +1,27 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Tuple, Optional
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
 from app.config_loader import load_config
+from app.scene.accel import ahocorasick, no_grad
+
+try:
+    import faiss  # type: ignore
+except ImportError:  # optional: fall back to the numpy int8 scan
+    faiss = None
+
+
+class Entity(NamedTuple):
+    """A resolved entity candidate; `canonical` is the interned catalog name."""
+
+    name: str
+    conf: float
+    data: Dict[str, Any]
+    canonical: str
 
 
 class SemanticEntityResolver:
@@ -10,151 +29,347 @@ class SemanticEntityResolver:
     
     def __init__(self):
         self.embeddings = None
+        self.embeddings_i8 = None
+        self._scales = None
+        self._index = None
         self.entity_names = []
-        self.entity_data = {}
+        self._row_canonical: List[str] = []
+        self._entity_idx_for_row = np.zeros(0, dtype=np.int32)
+        self._entities: List[Dict[str, Any]] = []
         self._config = None
+        self._model = None
+        self._lower_candidates: List[str] = []
+        self._cand_is_synonym = np.zeros(0, dtype=bool)
+        self._cand_entity_idx = np.zeros(0, dtype=np.intp)
+        self._entity_offsets = np.zeros(0, dtype=np.intp)
+        self._entities_list: List[Dict[str, Any]] = []
+        self._canonical_names: List[str] = []
+        self._aho = None
+        self._memo: "OrderedDict[tuple, List[Entity]]" = OrderedDict()
+        self._memo_max = 1024
+        self._memo_lock = threading.Lock()
+        self._load_lock = threading.Lock()
         
     def _get_config(self) -> Dict[str, Any]:
-        """Load entities config."""
+        """Load entities config and the lowercased candidate index used by lexical matching."""
         if self._config is None:
             config = load_config()
             self._config = config.get("entities", {})
+            self._build_candidate_index()
         return self._config
-    
+
+    def _build_candidate_index(self):
+        """Flatten every name/synonym (lowercased once) with its owning entity index."""
+        entities = self._config.get("entities", [])
+        candidates: List[str] = []
+        is_synonym: List[bool] = []
+        owners: List[int] = []
+        for i, entity in enumerate(entities):
+            terms = [(entity.get("name", ""), False)] + [(s, True) for s in entity.get("synonyms", [])]
+            for term, synonym in terms:
+                term = term.lower()
+                if term:
+                    candidates.append(term)
+                    is_synonym.append(synonym)
+                    owners.append(i)
+        self._entities_list = entities
+        self._canonical_names = [sys.intern(entity.get("name", "")) for entity in entities]
+        self._lower_candidates = candidates
+        self._cand_is_synonym = np.asarray(is_synonym, dtype=bool)
+        self._cand_entity_idx = np.asarray(owners, dtype=np.intp)
+        # Candidates are grouped by entity; each group starts where the owner changes
+        # (entities with no candidates simply have no group)
+        starts = np.ones(len(owners), dtype=bool)
+        starts[1:] = self._cand_entity_idx[1:] != self._cand_entity_idx[:-1]
+        self._entity_offsets = np.flatnonzero(starts)
+        self._aho = self._build_automaton(candidates, is_synonym, owners)
+
+    @staticmethod
+    def _build_automaton(candidates: List[str], is_synonym: List[bool], owners: List[int]):
+        """One Aho-Corasick automaton over all candidates: term -> [(entity_idx, is_synonym), ...]."""
+        if ahocorasick is None or not candidates:
+            return None
+        automaton = ahocorasick.Automaton()
+        for term, synonym, idx in zip(candidates, is_synonym, owners):
+            if term in automaton:
+                automaton.get(term).append((idx, synonym))
+            else:
+                automaton.add_word(term, [(idx, synonym)])
+        automaton.make_automaton()
+        return automaton
+
+    def reload(self):
+        """Drop cached config, candidate index and embeddings; next call reloads them."""
+        with self._load_lock:
+            self._config = None
+            self.embeddings = None
+            self.embeddings_i8 = None
+            self._scales = None
+            self._index = None
+            self.entity_names = []
+            self._row_canonical = []
+            self._entity_idx_for_row = np.zeros(0, dtype=np.int32)
+            self._entities = []
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Forget memoized resolve/lexical_overlap results."""
+        with self._memo_lock:
+            self._memo.clear()
+
+    def _memo_get(self, key: tuple) -> Optional[List[Entity]]:
+        with self._memo_lock:
+            hit = self._memo.get(key)
+            if hit is not None:
+                self._memo.move_to_end(key)
+                return list(hit)
+        return None
+
+    def _memo_put(self, key: tuple, results: List[Entity]) -> None:
+        with self._memo_lock:
+            self._memo[key] = list(results)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_max:
+                self._memo.popitem(last=False)
+
     def _load_embeddings(self):
-        """Lazy load entity embeddings."""
+        """Lazy load the embedding model and entity embeddings (once, thread-safe)."""
         if self.embeddings is not None:
             return
-            
+        with self._load_lock:
+            if self.embeddings is None:
+                self._build_embeddings()
+
+    def _build_embeddings(self):
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('all-MiniLM-L6-v2')
+            if self._model is None:
+                # Imported on first use: pulling in torch at module import dominates cold start
+                try:
+                    from sentence_transformers import SentenceTransformer  # type: ignore
+                except ImportError:  # optional: semantic entity resolution disabled
+                    print("Warning: sentence-transformers not installed. Semantic entity resolution disabled.")
+                    return
+                self._model = SentenceTransformer('all-MiniLM-L6-v2')
+            model = self._model
             
             config = self._get_config()
             entities = config.get("entities", [])
             
-            # Build entity names and data
+            # One row per name/synonym, each pointing back at its entity by index
             entity_names = []
-            entity_data = {}
+            entity_rows = []
             
-            for entity in entities:
-                name = entity.get("name", "")
-                synonyms = entity.get("synonyms", [])
-                entity_names.append(name)
-                entity_data[name] = entity
+            for i, entity in enumerate(entities):
+                entity_names.append(entity.get("name", ""))
+                entity_rows.append(i)
                 
                 # Add synonyms as separate entries
-                for synonym in synonyms:
+                for synonym in entity.get("synonyms", []):
                     entity_names.append(synonym)
-                    entity_data[synonym] = entity
+                    entity_rows.append(i)
             
-            # Generate embeddings for all names and synonyms
+            # Generate unit-length float32 embeddings so dot product == cosine similarity
             if entity_names:
-                self.embeddings = model.encode(entity_names)
+                with no_grad():
+                    embeddings = model.encode(
+                        entity_names,
+                        batch_size=64,
+                        show_progress_bar=False,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                    )
+                embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+                if faiss is not None:
+                    index = faiss.IndexFlatIP(embeddings.shape[1])
+                    index.add(embeddings)
+                    self._index = index
+                else:
+                    # Not encode(precision="int8"): its calibration is per-dimension and
+                    # asymmetric, so int8 dot products stop tracking cosine. Symmetric
+                    # per-row scales keep the coarse scan rank-faithful; the float32
+                    # rows stay for FAISS and for rescoring the shortlist.
+                    self.embeddings_i8, self._scales = self._quantize(embeddings)
+                self.embeddings = embeddings
                 self.entity_names = entity_names
-                self.entity_data = entity_data
+                self._row_canonical = [
+                    sys.intern(entities[i].get("name", row)) for row, i in zip(entity_names, entity_rows)
+                ]
+                self._entity_idx_for_row = np.asarray(entity_rows, dtype=np.int32)
+                self._entities = entities
                 
-        except ImportError:
-            print("Warning: sentence-transformers not installed. Semantic entity resolution disabled.")
         except Exception as e:
             print(f"Warning: Failed to load entity embeddings: {e}")
     
-    def resolve(self, text: str, k: int = 3) -> List[Tuple[str, float, Dict[str, Any]]]:
+    @staticmethod
+    def _quantize(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric per-row int8 quantization: row ~= q_row * scale."""
+        scales = np.abs(embeddings).max(axis=-1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(embeddings / scales[..., None]).astype(np.int8)
+        return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+    def _int8_similarities(self, query_embedding: np.ndarray, k: int) -> np.ndarray:
+        """Numpy fallback: coarse int8 scan, exact float32 rescore of a 4*k shortlist (others -inf)."""
+        # int32 accumulation; an int16 accumulator would overflow at 384 dims
+        query_i8, query_scale = self._quantize(query_embedding[None, :])
+        approx = np.einsum("ij,j->i", self.embeddings_i8, query_i8[0], dtype=np.int32)
+        approx = approx * (self._scales * query_scale[0])
+        shortlist = min(len(approx), k * 4)
+        candidates = np.argpartition(approx, -shortlist)[-shortlist:]
+        
+        # Cosine similarities (both sides are normalized)
+        similarities = np.full(len(self.embeddings), -np.inf, dtype=np.float32)
+        similarities[candidates] = self.embeddings[candidates] @ query_embedding
+        return similarities
+
+    def resolve(self, text: str, k: int = 3) -> List[Entity]:
         """
         Resolve text to entities using embedding similarity.
-        Returns list of (entity_name, confidence, entity_data) tuples.
+        Returns list of Entity(name, conf, data, canonical) tuples.
         """
         self._load_embeddings()
         
         if self.embeddings is None:
             return []
+        
+        # The model is uncased, so case/edge whitespace don't change the embedding
+        text = text.strip().lower()
+        memo_key = ("resolve", text, k)
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            return cached
             
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Encode input text with the cached model
+            with no_grad():
+                query_embedding = self._model.encode(
+                    [text], show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True
+                )
+            query_embedding = np.asarray(query_embedding[0], dtype=np.float32)
             
-            # Encode input text
-            query_embedding = model.encode([text])
+            k = min(k, len(self.embeddings))
+            if k <= 0:
+                return []
             
-            # Compute similarities
-            import numpy as np
-            similarities = np.dot(query_embedding, self.embeddings.T)[0]
-            
-            # Get top-k results
-            top_indices = np.argsort(similarities)[::-1][:k]
+            if self._index is not None:
+                # FAISS exact inner-product search (cosine on normalized vectors)
+                scores, ids = self._index.search(query_embedding[None, :], k)
+                keep = ids[0] >= 0
+                top_indices, top_scores = ids[0][keep], scores[0][keep]
+            else:
+                similarities = self._int8_similarities(query_embedding, k)
+                # Get top-k results: O(N) partition, then sort only the k survivors
+                top_indices = np.argpartition(similarities, -k)[-k:]
+                top_scores = similarities[top_indices]
+            # Highest similarity first; ties keep catalog order
+            order = np.lexsort((top_indices, -top_scores))
             
             results = []
-            for idx in top_indices:
-                if similarities[idx] > 0.3:  # Minimum similarity threshold
-                    entity_name = self.entity_names[idx]
-                    entity_data = self.entity_data[entity_name]
-                    results.append((entity_name, float(similarities[idx]), entity_data))
-                    
+            for idx, score in zip(top_indices[order].tolist(), top_scores[order].tolist()):
+                if score > 0.3:  # Minimum similarity threshold
+                    entity = self._entities[self._entity_idx_for_row[idx]]
+                    results.append(Entity(self.entity_names[idx], score, entity, self._row_canonical[idx]))
+            
+            self._memo_put(memo_key, results)
             return results
             
         except Exception as e:
             print(f"Warning: Entity resolution failed: {e}")
             return []
     
-    def lexical_overlap(self, text: str) -> List[Tuple[str, float, Dict[str, Any]]]:
+    def lexical_overlap(self, text: str) -> List[Entity]:
         """
         Fallback lexical entity resolution using fuzzy matching.
         """
+        text = text.strip().lower()
+        memo_key = ("lexical", text)
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            return cached
+        
+        results = self._fuzzy_overlap(text)
+        self._memo_put(memo_key, results)
+        return results
+    
+    def _fuzzy_overlap(self, text_lower: str) -> List[Entity]:
         try:
-            from rapidfuzz.fuzz import partial_ratio
+            from rapidfuzz import fuzz, process
         except ImportError:
             # Fallback to simple string matching if rapidfuzz not available
-            return self._simple_lexical_overlap(text)
+            return self._simple_lexical_overlap(text_lower)
             
-        config = self._get_config()
-        entities = config.get("entities", [])
+        self._get_config()
+        candidates = self._lower_candidates
+        entities = self._entities_list
+        if not candidates:
+            return []
         
-        text_lower = text.lower()
-        results = []
+        # Score every candidate in one native call; anything under 70 comes back as 0
+        scores = process.cdist(
+            [text_lower], candidates,
+            scorer=fuzz.partial_ratio, score_cutoff=70, dtype=np.float64,
+        )[0]
+        offsets = self._entity_offsets
+        best_scores = np.maximum.reduceat(scores, offsets)
         
-        for entity in entities:
-            name = entity.get("name", "").lower()
-            synonyms = [s.lower() for s in entity.get("synonyms", [])]
-            
-            # Check name and synonyms with fuzzy matching
-            candidates = [name] + synonyms
-            best_score = 0
-            
-            for candidate in candidates:
-                if candidate:
-                    score = partial_ratio(text_lower, candidate)
-                    best_score = max(best_score, score)
-            
-            # Use threshold of 70 for fuzzy matching
-            if best_score >= 70:
-                results.append((entity["name"], best_score / 100.0, entity))
+        results = []
+        for group in np.flatnonzero(best_scores >= 70):
+            idx = self._cand_entity_idx[offsets[group]]
+            name = self._canonical_names[idx]
+            results.append(Entity(name, float(best_scores[group]) / 100.0, entities[idx], name))
         
         return results
     
-    def _simple_lexical_overlap(self, text: str) -> List[Tuple[str, float, Dict[str, Any]]]:
-        """Simple lexical matching fallback."""
-        config = self._get_config()
-        entities = config.get("entities", [])
+    def _simple_lexical_overlap(self, text_lower: str) -> List[Entity]:
+        """Simple lexical matching fallback (text already lowercased by the caller)."""
+        self._get_config()
         
-        text_lower = text.lower()
-        results = []
+        hits: Dict[int, float] = {}
         
-        for entity in entities:
-            name = entity.get("name", "").lower()
-            synonyms = [s.lower() for s in entity.get("synonyms", [])]
-            
-            # Check for exact matches
-            if name in text_lower:
-                results.append((entity["name"], 1.0, entity))
-            else:
-                # Check synonyms
-                for synonym in synonyms:
-                    if synonym in text_lower:
-                        results.append((entity["name"], 0.8, entity))
-                        break
+        # Exact substring matches: names score 1.0, synonyms 0.8
+        if self._aho is not None:
+            matches = (owner for _, owners in self._aho.iter(text_lower) for owner in owners)
+        else:
+            matches = (
+                (idx, synonym)
+                for candidate, synonym, idx in zip(self._lower_candidates, self._cand_is_synonym.tolist(), self._cand_entity_idx.tolist())
+                if candidate in text_lower
+            )
+        for idx, synonym in matches:
+            score = 0.8 if synonym else 1.0
+            if score > hits.get(idx, 0.0):
+                hits[idx] = score
+        
+        results = []
+        for idx in sorted(hits):
+            name = self._canonical_names[idx]
+            results.append(Entity(name, hits[idx], self._entities_list[idx], name))
         
         return results
 
 
-# Global instance
-entity_resolver = SemanticEntityResolver()
\ No newline at end of file
+# Global instance, built on first get_entity_resolver() call
+_entity_resolver: Optional[SemanticEntityResolver] = None
+_entity_resolver_lock = threading.Lock()
+
+
+def get_entity_resolver() -> SemanticEntityResolver:
+    global _entity_resolver
+    if _entity_resolver is None:
+        with _entity_resolver_lock:
+            if _entity_resolver is None:
+                _entity_resolver = SemanticEntityResolver()
+    return _entity_resolver
+
+
+def reload_entity_resolver() -> None:
+    """Make the resolver re-read its config, if one has been built (no-op otherwise)."""
+    if _entity_resolver is not None:
+        _entity_resolver.reload()
+
+
+def __getattr__(name: str):
+    # Keeps `from ... import entity_resolver` working for scripts; that import builds it
+    if name == "entity_resolver":
+        return get_entity_resolver()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
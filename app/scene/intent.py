@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import json
 import os
 
+from .accel import matched_ranks, phrase_automaton
 from .values import numeric_parser
 
 SWITCH_TARGETS = {
@@ -28,8 +29,78 @@ VALUE_TARGETS = {
     "brightness": "brightness",
 }
 
+# Overlay/switch targets that "show me"/"give me <target>" turns on
+_OVERLAY_TARGETS = frozenset({"handles", "xray_flashlight", "show_nerve", "show_sinus"})
+_GIVE_ME_TARGETS = _OVERLAY_TARGETS | {"align_implants"}
+
+# Information requests are never control intents
+_INFO_MARKERS = (
+    "information on",
+    "info on",
+    "information about",
+    "tell me about",
+    "explain",
+    "provide me information on",
+    "provide me information about",
+)
+
+_DEFAULT_VERBS = {
+    "on": ("turn on", "enable", "switch on", "start", "show", "give me", "provide me with"),
+    "off": ("turn off", "disable", "switch off", "stop", "hide"),
+    "toggle": ("toggle",),
+}
+
+
+_SWITCH_PHRASES = tuple(SWITCH_TARGETS.items())
+_SWITCH_KEYS = tuple(phrase for phrase, _ in _SWITCH_PHRASES)
+
+
+_SWITCH_AUTOMATON = phrase_automaton(_SWITCH_KEYS)
+
+
+def _matched_switches(text: str) -> List[Tuple[str, str]]:
+    """(phrase, target) pairs from SWITCH_TARGETS found in text, in table order."""
+    return [_SWITCH_PHRASES[rank] for rank in matched_ranks(_SWITCH_AUTOMATON, _SWITCH_KEYS, text)]
+
+
+_INTENT_CONFIG_PATH = os.path.join("config", "intent.json")
+VerbPhrases = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
 
-def _find_phrase(text: str, phrases: list[str]) -> Optional[str]:
+# (config mtime, (on, off, toggle) verb phrases with a trailing space)
+_verb_cache: Optional[Tuple[Optional[int], VerbPhrases]] = None
+
+
+def _load_verbs() -> VerbPhrases:
+    verbs = dict(_DEFAULT_VERBS)
+    try:
+        with open(_INTENT_CONFIG_PATH, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+            if isinstance(cfg.get("verbs"), dict):
+                for k in ("on", "off", "toggle"):
+                    if isinstance(cfg["verbs"].get(k), list):
+                        verbs[k] = [v.lower() for v in cfg["verbs"][k]]
+    except Exception:
+        pass
+    on_verbs, off_verbs, toggle_verbs = (
+        tuple(v + (" " if not v.endswith(" ") else "") for v in verbs[k]) for k in ("on", "off", "toggle")
+    )
+    return on_verbs, off_verbs, toggle_verbs
+
+
+def _get_verbs() -> VerbPhrases:
+    """Verb phrases from config/intent.json, re-read only when its mtime changes."""
+    global _verb_cache
+    try:
+        mtime: Optional[int] = os.stat(_INTENT_CONFIG_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    cache = _verb_cache
+    if cache is None or cache[0] != mtime:
+        cache = _verb_cache = (mtime, _load_verbs())
+    return cache[1]
+
+
+def _find_phrase(text: str, phrases: Sequence[str]) -> Optional[str]:
     for p in phrases:
         if p in text:
             return p
@@ -57,16 +128,7 @@ def parse_intent(message: str) -> Optional[Dict[str, Any]]:
         return {"type": "ask_location", "text": text}
 
     # If user asks for information/definitions, do not treat as control intent
-    info_markers = [
-        "information on",
-        "info on",
-        "information about",
-        "tell me about",
-        "explain",
-        "provide me information on",
-        "provide me information about",
-    ]
-    if any(m in text for m in info_markers):
+    if any(m in text for m in _INFO_MARKERS):
         return None
 
     # Brightness/contrast numeric control using robust parser
@@ -78,44 +140,30 @@ def parse_intent(message: str) -> Optional[Dict[str, Any]]:
                     value, confidence = val
                     return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": float(value)}}
 
-    # Switch verbs
-    # Load verbs from config
-    verbs = {
-        "on": ["turn on", "enable", "switch on", "start", "show", "give me", "provide me with"],
-        "off": ["turn off", "disable", "switch off", "stop", "hide"],
-        "toggle": ["toggle"],
-    }
-    try:
-        with open(os.path.join("config", "intent.json"), "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-            if isinstance(cfg.get("verbs"), dict):
-                for k in ("on", "off", "toggle"):
-                    if isinstance(cfg["verbs"].get(k), list):
-                        verbs[k] = [v.lower() for v in cfg["verbs"][k]]
-    except Exception:
-        pass
-
-    on_verbs = [v + (" " if not v.endswith(" ") else "") for v in verbs["on"]]
-    off_verbs = [v + (" " if not v.endswith(" ") else "") for v in verbs["off"]]
-    toggle_verbs = [v + (" " if not v.endswith(" ") else "") for v in verbs["toggle"]]
-
-    # Map switches; prefer explicit targets
-    for phrase, target in SWITCH_TARGETS.items():
-        if phrase in text:
-            if _find_phrase(text, on_verbs):
-                return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "on"}}
-            if _find_phrase(text, off_verbs):
-                return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "off"}}
-            if _find_phrase(text, toggle_verbs):
-                return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "toggle"}}
-            # "show me the handles" or "give me sinuses" -> ON for overlays/switches
-            if target in {"handles", "xray_flashlight", "show_nerve", "show_sinus"} and (text.startswith("show") or text.startswith("give me") or text.startswith("provide me with")):
-                return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "on"}}
+    # Switch verbs (from config, cached until the file changes)
+    on_verbs, off_verbs, toggle_verbs = _get_verbs()
+
+    # Map switches; prefer explicit targets. One scan finds every target phrase;
+    # a verb applies to the first of them, in SWITCH_TARGETS order
+    switches = _matched_switches(text)
+    if switches:
+        target = switches[0][1]
+        if _find_phrase(text, on_verbs):
+            return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "on"}}
+        if _find_phrase(text, off_verbs):
+            return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "off"}}
+        if _find_phrase(text, toggle_verbs):
+            return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "toggle"}}
+        # "show me the handles" or "give me sinuses" -> ON for overlays/switches
+        if text.startswith(("show", "give me", "provide me with")):
+            for _, target in switches:
+                if target in _OVERLAY_TARGETS:
+                    return {"tool": "control", "arguments": {"hand": "right", "target": target, "operation": "set", "value": "on"}}
 
     # "give me the <switch>" / "provide me with <switch>" → ON for overlays/switch targets
-    if text.startswith("give me") or text.startswith("give me the") or text.startswith("provide me with"):
-        for phrase, target in SWITCH_TARGETS.items():
-            if phrase in text and target in {"handles", "xray_flashlight", "show_nerve", "show_sinus", "align_implants"}:
+    if text.startswith(("give me", "provide me with")):
+        for _, target in switches:
+            if target in _GIVE_ME_TARGETS:
                 return {
                     "tool": "control",
                     "arguments": {"hand": "right", "target": target, "operation": "set", "value": "on"},
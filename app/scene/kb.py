@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+from .accel import matched_ranks, phrase_automaton
 
 
 # Canonical entities and their locations in the scene
@@ -42,31 +44,43 @@ SYNONYM_TO_ENTITY: Dict[str, str] = {
 }
 
 
+_FRIENDLY_NAMES: Dict[str, str] = {
+    "skull_model": "skull model",
+    "implants": "implants",
+    "menu_bar": "menu bar",
+    "xray_display": "X-ray display",
+    "control_panel": "control panel",
+    "dental_tray": "dental tray",
+}
+
+# Try longest synonym first to avoid partial matches; sorted once at import
+_SORTED_SYNONYMS = tuple(sorted(SYNONYM_TO_ENTITY, key=len, reverse=True))
+
+
+_SYNONYM_AUTOMATON = phrase_automaton(_SORTED_SYNONYMS)
+
+
+def _matched_synonyms(q: str) -> Iterator[str]:
+    """Synonyms contained in q, longest first."""
+    # Ranks order the hits like _SORTED_SYNONYMS
+    return (_SORTED_SYNONYMS[rank] for rank in matched_ranks(_SYNONYM_AUTOMATON, _SORTED_SYNONYMS, q))
+
+
 def resolve_location(question: str) -> Optional[str]:
     """Return a deterministic location answer if the question mentions a known entity.
 
     Example: "Where is the skull?" -> "The skull model is on the left."
     """
     q = question.strip().lower()
-    # Try longest synonym first to avoid partial matches
-    for synonym in sorted(SYNONYM_TO_ENTITY.keys(), key=len, reverse=True):
-        if synonym in q:
-            entity = SYNONYM_TO_ENTITY[synonym]
-            loc = ENTITY_TO_LOCATION.get(entity)
-            if not loc:
-                return None
-            friendly = {
-                "skull_model": "skull model",
-                "implants": "implants",
-                "menu_bar": "menu bar",
-                "xray_display": "X-ray display",
-                "control_panel": "control panel",
-                "dental_tray": "dental tray",
-            }.get(entity, entity)
-            # Phrase consistently
-            if loc.startswith("above") or loc.startswith("far-"):
-                return f"The {friendly} is {loc}."
-            return f"The {friendly} is on the {loc}."
-    return None
-
-
+    synonym = next(_matched_synonyms(q), None)
+    if synonym is None:
+        return None
+    entity = SYNONYM_TO_ENTITY[synonym]
+    loc = ENTITY_TO_LOCATION.get(entity)
+    if not loc:
+        return None
+    friendly = _FRIENDLY_NAMES.get(entity, entity)
+    # Phrase consistently
+    if loc.startswith("above") or loc.startswith("far-"):
+        return f"The {friendly} is {loc}."
+    return f"The {friendly} is on the {loc}."
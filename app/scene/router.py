@@ -1,25 +1,211 @@
 from __future__ import annotations
 
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import re
+import string
+import threading
 from typing import Any, Dict, List, Tuple, Optional, Union
 from app.config_loader import load_config
+from app.scene.accel import ahocorasick
 from app.scene.classifier import classifier
-from app.scene.entity_resolver import entity_resolver
+from app.scene.entity_resolver import Entity, get_entity_resolver, reload_entity_resolver
 from app.scene.values import numeric_parser
 from app.scene.intent import parse_intent
-from app.logging import confidence_logger
+from app.scene.defs import resolve_definition
+from app.logging import get_confidence_logger
+from app.tools.control import reset_cache as reset_control_cache
+
+try:
+    from app.llm.ollama_client import OllamaClient
+    _OLLAMA_AVAILABLE = True
+except ImportError:  # optional: no LLM tie-breaker
+    OllamaClient = None
+    _OLLAMA_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+_ollama_client: Optional["OllamaClient"] = None
+
+
+def _get_ollama() -> "OllamaClient":
+    """Shared Ollama client for the LLM tie-breaker (one HTTP session per process)."""
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = OllamaClient()
+    return _ollama_client
+
+
+_entity_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_entity_executor() -> ThreadPoolExecutor:
+    """Shared worker pool that resolves entities while the intent is being classified."""
+    global _entity_executor
+    if _entity_executor is None:
+        _entity_executor = ThreadPoolExecutor(thread_name_prefix="router-entities")
+    return _entity_executor
+
+
+def _resolve_entities(text: str, lexical_cutoff: float) -> Tuple[List[Entity], List[Entity]]:
+    """Semantic then lexical entity candidates. Kept in one task: both share the resolver's lazy index."""
+    # Cheap lexical pass first; a confident hit makes the embedding lookup redundant
+    entity_resolver = get_entity_resolver()
+    lexical = entity_resolver.lexical_overlap(text)
+    semantic: List[Entity] = []
+    if max((entity.conf for entity in lexical), default=0.0) < lexical_cutoff:
+        semantic = entity_resolver.resolve(text, k=3)
+    return semantic, lexical
+
+_DIGIT_RE = re.compile(r"\d")
+_VALUE_INTENTS = frozenset({"control_value", "size_request"})
+_CONTROL_INTENTS = frozenset({"control_on", "control_off"})
+_INFO_INTENTS = frozenset({"info_definition", "info_location"})
+
+# Keyword fallback for intents, typo variants included. Checked in this order,
+# so info questions take priority over control actions.
+_CONTROL_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "info_definition": (
+        "what is", "what are", "definition", "tell me about", "information",
+        "wat is", "wat are", "definiton", "infomation",
+    ),
+    "info_location": (
+        "where is", "where are", "which side", "what side",
+        "were is", "were are", "wich side", "wat side",
+    ),
+    "control_on": (
+        "turn on", "activate", "enable", "switch on", "start", "show",
+        "give me", "provide me", "bring up", "turnn on", "tirn on",
+        "turnn", "tirn", "activat", "enabl", "swich on",
+    ),
+    "control_off": (
+        "turn off", "deactivate", "disable", "switch off", "stop", "hide",
+        "turnn off", "tirn off", "deactivat", "disabl", "swich off",
+    ),
+}
+# Static clarification templates. The tuples are copied into fresh lists when a
+# response is built, so callers can't mutate the shared templates.
+_FALLBACK_RESPONSE: Dict[str, Any] = {
+    "type": "clarification",
+    "message": "I'm not sure what you're asking for.",
+    "clarifications": (
+        "Try asking about scene elements (e.g., 'what are handles?')",
+        "Try control commands (e.g., 'turn on x-ray')",
+        "Try location questions (e.g., 'where is the skull?')",
+    ),
+}
+_SIZE_REQUEST_RESPONSE: Dict[str, Any] = {
+    "type": "clarification",
+    "message": "Which size for implants?",
+    "clarifications": (
+        "Provide height_y_mm (3.0–4.8) and length_z_mm (6–17)",
+        "Example: 'give me implant size 4 x 11.5'",
+    ),
+}
+_SIZE_REQUEST_CONFIDENCE: Dict[str, float] = {"intent": 0.8, "entity": 0.0, "value": 0.0}
+_IMPLANT_CHOICE_RESPONSE: Dict[str, Any] = {
+    "type": "clarification",
+    "message": "Do you want to show the implants overlay or hear a quick definition?",
+    "clarifications": (
+        "Turn on implants overlay",
+        "Tell me about implants",
+    ),
+}
+_WS_RE = re.compile(r"\s+")
+_NON_WORD_TABLE = str.maketrans("", "", string.punctuation + string.digits)
+
+
+def _words_only(text: str) -> str:
+    """Cheap normalization: drop punctuation/digits, collapse whitespace, lowercase."""
+    return _WS_RE.sub(" ", text.translate(_NON_WORD_TABLE)).strip().lower()
 
 
 class DecisionRouter:
     """Combines intent, entity, and value parsing with confidence-based routing."""
     
     def __init__(self):
-        self._config = None
+        self._load()
+        # (predicate, override) pairs applied in order after classification
+        self._intent_rules = [
+            (self._below_intent_threshold, self._apply_fuzzy),
+            (self._needs_llm, self._apply_llm),
+            (self._is_implant_request, self._apply_implant_override),
+        ]
+        # Intent-specific suggestions used by _generate_clarification when the entity is unclear
+        self._clarify_by_intent = {
+            **dict.fromkeys(_CONTROL_INTENTS, self._clarify_switch_target),
+            **dict.fromkeys(_INFO_INTENTS, self._clarify_info_target),
+        }
+    
+    def _load(self):
+        """Pull the config slices the router needs from a single load_config() call."""
+        cfg = load_config()
+        self._config = cfg.get("intent", {})
+        self._entity_cfg = cfg.get("entities", {}).get("entities", [])
+        self._ranges_cfg = cfg.get("ranges", {})
+        self._value_targets = [e for e in self._entity_cfg if e.get("type") == "value"]
+        self._switch_targets = [e for e in self._entity_cfg if e.get("type") == "switch"]
+        # (name, lowercased synonyms) per value control, in config order
+        self._value_terms = [
+            (e.get("name", ""), [syn.lower() for syn in e.get("synonyms", [])]) for e in self._value_targets
+        ]
+        self._value_automaton = self._build_value_automaton(self._value_terms)
+        # Fast-path clarification for a bare number; ranges are static per config load
+        self._likely_value_targets_str = ", ".join(self._format_range(n) for n in ("contrast", "brightness"))
+        self._likely_clarification = f"Choose one: {self._likely_value_targets_str}"
+        thresholds = self._config.get("thresholds", {})
+        self._intent_threshold = float(thresholds.get("intent_confidence", 0.6))
+        self._entity_threshold = float(thresholds.get("entity_confidence", 0.5))
+        self._router_cutoff = float(thresholds.get("router_cutoff", 0.3))
+        labels = self._config.get("classifier", {}).get("labels", [])
+        self._label_set = frozenset(labels)
+        label_list = ", ".join(labels).replace("{", "{{").replace("}", "}}")
+        self._llm_prompt_template = (
+            f"Classify this user input into one of these exact labels: {label_list}\n"
+            "\n"
+            'User input: "{text}"\n'
+            "\n"
+            'Respond with only the label name (e.g., "control_on", "info_definition", etc.). No explanation.'
+        )
+    
+    def _format_range(self, name: str) -> str:
+        """'name (min–max)' when the control has a configured range, else just the name."""
+        r = self._ranges_cfg.get(name, {})
+        r_min = r.get("min")
+        r_max = r.get("max")
+        if r_min is not None and r_max is not None:
+            return f"{name} ({r_min}–{r_max})"
+        return name
+    
+    @staticmethod
+    def _build_value_automaton(value_terms: List[Tuple[str, List[str]]]):
+        """Aho-Corasick automaton over value-control names/synonyms -> [(config_order, name), ...]."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for order, (name, syns) in enumerate(value_terms):
+            for term in [name] + syns:
+                if not term:
+                    continue
+                if term in automaton:
+                    automaton.get(term).append((order, name))
+                else:
+                    automaton.add_word(term, [(order, name)])
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+    
+    def reload(self):
+        """Re-read config files from disk (see reload_config()) and repopulate this router."""
+        reload_config()
+        if self is not _decision_router:
+            self._load()
         
     def _get_config(self) -> Dict[str, Any]:
-        """Load intent config."""
-        if self._config is None:
-            config = load_config()
-            self._config = config.get("intent", {})
+        """Intent config."""
         return self._config
     
     def route(self, text: str) -> Dict[str, Any]:
@@ -27,20 +213,14 @@ class DecisionRouter:
         Route user input to appropriate action.
         Returns structured response with tool action or clarification request.
         """
-        config = self._get_config()
-        thresholds = config.get("thresholds", {})
-        
-        intent_threshold = thresholds.get("intent_confidence", 0.6)
-        entity_threshold = thresholds.get("entity_confidence", 0.5)
-        value_threshold = thresholds.get("value_confidence", 0.4)
-        router_cutoff = thresholds.get("router_cutoff", 0.3)
+        text_lower = text.lower()
         
         # 0. Deterministic fast-path for explicit numeric controls (e.g., "set brightness to 50%")
         # Try to detect numeric value and a value target lexically from config before ML routing
-        fast_value = numeric_parser.parse_value(text)
+        fast_value = numeric_parser.parse_value(text, text_lower=text_lower)
         if fast_value:
             fast_value_num, fast_value_conf = fast_value
-            target_name, matched_candidates = self._detect_value_target(text)
+            target_name, matched_candidates = self._detect_value_target(text, text_lower)
             if target_name:
                 # Return direct control action with detected target and parsed value
                 return {
@@ -59,23 +239,12 @@ class DecisionRouter:
                     },
                 }
             # If we detected a number but not a clear value target → targeted clarification
-            # Suggest likely value controls from config with ranges
-            cfg = load_config()
-            ranges_cfg = cfg.get("ranges", {})
-            likely = []
-            for name in ("contrast", "brightness"):
-                r = ranges_cfg.get(name, {})
-                r_min = r.get("min")
-                r_max = r.get("max")
-                if r_min is not None and r_max is not None:
-                    likely.append(f"{name} ({r_min}–{r_max})")
-                else:
-                    likely.append(name)
+            # Suggest likely value controls from config with ranges (prebuilt in _load)
             return {
                 "type": "clarification",
                 "message": f"I detected value {fast_value_num}. Which control should I apply it to?",
                 "clarifications": [
-                    f"Choose one: {', '.join(likely)}",
+                    self._likely_clarification,
                 ],
                 "confidence": {
                     "intent": 0.7,
@@ -84,46 +253,24 @@ class DecisionRouter:
                 },
             }
 
+        # Entity resolution doesn't depend on the intent; start it on a worker so it
+        # overlaps with classification (and the LLM tie-breaker, if that runs)
+        entity_future = _get_entity_executor().submit(_resolve_entities, text, self._entity_threshold + 0.2)
+        
         # 1. Intent classification (ML-only approach)
         intent_label, intent_confidence = classifier.classify(text)
         
-        # Fuzzy matching fallback for typos when semantic classifier fails
-        if intent_confidence < intent_threshold:
-            fuzzy_label, fuzzy_confidence = self._fuzzy_intent_match(text)
-            if fuzzy_confidence > intent_confidence:
-                intent_label, intent_confidence = fuzzy_label, fuzzy_confidence
-        
-        # LLM tie-breaker for low confidence cases (only if Ollama is available)
-        if intent_confidence < intent_threshold:
-            try:
-                llm_label, llm_confidence = self._llm_classify(text)
-                if llm_confidence > intent_confidence:
-                    intent_label, intent_confidence = llm_label, llm_confidence
-            except Exception:
-                # Ollama not available, skip LLM fallback
-                pass
-        
-        # Special handling for implant requests
-        if "implant" in text.lower() and ("give me" in text.lower() or "provide me" in text.lower()):
-            if any(char.isdigit() for char in text):
-                # Has specific size - treat as control action
-                intent_label = "control_value"
-                intent_confidence = 0.9
-            else:
-                # No specific size - ask for size
-                intent_label = "size_request"
-                intent_confidence = 0.8
+        # Ordered overrides: fuzzy keywords, LLM tie-breaker, implant special-case
+        for applies, apply in self._intent_rules:
+            if applies(text, text_lower, intent_confidence):
+                intent_label, intent_confidence = apply(text, text_lower, intent_label, intent_confidence)
         # Additional disambiguation for "show me the implants" – offer definition vs overlay control
-        if "show me" in text.lower() and "implant" in text.lower():
+        if "implant" in text_lower and "show me" in text_lower:
             # If confidence is low, ask targeted clarification instead of generic one
             if intent_confidence < 0.7:
                 return {
-                    "type": "clarification",
-                    "message": "Do you want to show the implants overlay or hear a quick definition?",
-                    "clarifications": [
-                        "Turn on implants overlay",
-                        "Tell me about implants",
-                    ],
+                    **_IMPLANT_CHOICE_RESPONSE,
+                    "clarifications": list(_IMPLANT_CHOICE_RESPONSE["clarifications"]),
                     "confidence": {
                         "intent": intent_confidence,
                         "entity": 0.4,
@@ -131,46 +278,35 @@ class DecisionRouter:
                     },
                 }
         
-        # 2. Entity resolution
-        semantic_entities = entity_resolver.resolve(text, k=3)
-        lexical_entities = entity_resolver.lexical_overlap(text)
-        
-        # Combine entity results
-        entity_results = []
-        seen_entities = set()
+        # 2. Entity resolution (started above)
+        semantic_entities, lexical_entities = entity_future.result()
         
-        for name, conf, data in semantic_entities:
-            if name not in seen_entities:
-                entity_results.append((name, conf, data))
-                seen_entities.add(name)
-        
-        for name, conf, data in lexical_entities:
-            if name not in seen_entities:
-                entity_results.append((name, conf, data))
-                seen_entities.add(name)
-        
-        # Get best entity - prefer semantic over lexical, and longer/more specific matches
+        # Combine entity results: first occurrence of each name wins, semantic before lexical.
+        # The best entity is tracked in the same pass: prefer higher confidence, semantic
+        # hits and longer (more specific) names; ties keep the earlier candidate.
+        semantic_names = frozenset(entity.name for entity in semantic_entities)
+        merged: Dict[str, Entity] = {}
         best_entity = None
-        entity_confidence = 0.0
-        if entity_results:
-            # Sort by confidence, but prefer semantic entities and longer entity names
-            def entity_score(entity):
-                name, conf, data = entity
-                # Boost semantic entities (they come first in the list)
-                semantic_boost = 0.1 if name in [e[0] for e in semantic_entities] else 0.0
-                # Boost longer entity names (more specific)
-                length_boost = len(name) * 0.01
-                return conf + semantic_boost + length_boost
-            
-            best_entity = max(entity_results, key=entity_score)
-            entity_confidence = best_entity[1]
+        best_score = 0.0
+        for entity in itertools.chain(semantic_entities, lexical_entities):
+            if entity.name in merged:
+                continue
+            merged[entity.name] = entity
+            semantic_boost = 0.1 if entity.name in semantic_names else 0.0
+            length_boost = len(entity.name) * 0.01
+            score = entity.conf + semantic_boost + length_boost
+            if best_entity is None or score > best_score:
+                best_entity, best_score = entity, score
+        entity_results = list(merged.values())
+        entity_confidence = best_entity.conf if best_entity is not None else 0.0
         
         # 3. Value parsing
         value_result = None
         value_confidence = 0.0
         
-        if intent_label in ["control_value", "size_request"]:
-            value_result = numeric_parser.parse_value(text)
+        if intent_label in _VALUE_INTENTS:
+            # Same text as the step-0 fast path; reuse its parse instead of running it again
+            value_result = fast_value
             if value_result:
                 _, value_confidence = value_result
         
@@ -178,7 +314,7 @@ class DecisionRouter:
         overall_confidence = min(intent_confidence, entity_confidence) if entity_confidence > 0 else intent_confidence
         
         # Check if we need clarification
-        if overall_confidence < router_cutoff:
+        if overall_confidence < self._router_cutoff:
             # Provide richer, context-aware clarifications using top entity candidates
             top_candidates = entity_results[:5] if entity_results else []
             clarification_response = self._generate_clarification(
@@ -191,162 +327,131 @@ class DecisionRouter:
                 value_confidence,
                 top_candidates,
             )
-            confidence_logger.log_clarification(text, clarification_response["clarifications"], clarification_response["confidence"])
+            get_confidence_logger().log_clarification(text, clarification_response["clarifications"], clarification_response["confidence"])
             return clarification_response
         
-        # Route to appropriate action
-        if intent_label.startswith("control_"):
-            control_response = self._generate_control_action(intent_label, best_entity, value_result, text)
-            if control_response.get("type") == "tool_action":
-                confidence_logger.log_tool_action(text, control_response["tool"], control_response["arguments"], control_response["confidence"])
-            return control_response
-        elif intent_label.startswith("info_"):
-            info_response = self._generate_info_response(intent_label, best_entity, text)
-            confidence_logger.log_answer(text, info_response["answer"], info_response["context_used"], info_response["confidence"])
-            return info_response
-        elif intent_label == "size_request":
-            size_response = self._generate_size_request_response(text)
-            confidence_logger.log_clarification(text, size_response["clarifications"], size_response["confidence"])
-            return size_response
-        else:
-            fallback_response = self._generate_fallback_response(text)
-            confidence_logger.log_clarification(text, fallback_response["clarifications"], {})
-            return fallback_response
+        # Route to appropriate action by intent family ("control_on" -> "control")
+        match intent_label.partition("_")[0]:
+            case "control":
+                control_response = self._generate_control_action(intent_label, best_entity, value_result, text)
+                if control_response.get("type") == "tool_action":
+                    get_confidence_logger().log_tool_action(text, control_response["tool"], control_response["arguments"], control_response["confidence"])
+                return control_response
+            case "info":
+                info_response = self._generate_info_response(intent_label, best_entity, text)
+                get_confidence_logger().log_answer(text, info_response["answer"], info_response["context_used"], info_response["confidence"])
+                return info_response
+            case "size" if intent_label == "size_request":
+                size_response = self._generate_size_request_response(text)
+                get_confidence_logger().log_clarification(text, size_response["clarifications"], size_response["confidence"])
+                return size_response
+            case _:
+                fallback_response = self._generate_fallback_response(text)
+                get_confidence_logger().log_clarification(text, fallback_response["clarifications"], {})
+                return fallback_response
+
+    def _below_intent_threshold(self, text: str, text_lower: str, confidence: float) -> bool:
+        return confidence < self._intent_threshold
 
-    def _detect_value_target(self, text: str) -> Tuple[Optional[str], List[str]]:
+    def _apply_fuzzy(self, text: str, text_lower: str, label: str, confidence: float) -> Tuple[str, float]:
+        """Fuzzy matching fallback for typos when semantic classifier fails."""
+        fuzzy_label, fuzzy_confidence = self._fuzzy_intent_match(text, text_lower)
+        if fuzzy_confidence > confidence:
+            return fuzzy_label, fuzzy_confidence
+        return label, confidence
+
+    def _needs_llm(self, text: str, text_lower: str, confidence: float) -> bool:
+        # Nothing left to classify once punctuation/digits are stripped -> skip the round-trip
+        return confidence < self._intent_threshold and bool(_words_only(text))
+
+    def _apply_llm(self, text: str, text_lower: str, label: str, confidence: float) -> Tuple[str, float]:
+        """LLM tie-breaker for low confidence cases (only if Ollama is available)."""
+        try:
+            llm_label, llm_confidence = self._llm_classify(text)
+            if llm_confidence > confidence:
+                return llm_label, llm_confidence
+        except Exception:
+            # Ollama not available, skip LLM fallback
+            pass
+        return label, confidence
+
+    def _is_implant_request(self, text: str, text_lower: str, confidence: float) -> bool:
+        return "implant" in text_lower and ("give me" in text_lower or "provide me" in text_lower)
+
+    def _apply_implant_override(self, text: str, text_lower: str, label: str, confidence: float) -> Tuple[str, float]:
+        """Special handling for implant requests."""
+        if _DIGIT_RE.search(text):
+            # Has specific size - treat as control action
+            return "control_value", 0.9
+        # No specific size - ask for size
+        return "size_request", 0.8
+
+    def _detect_value_target(self, text: str, text_lower: Optional[str] = None) -> Tuple[Optional[str], List[str]]:
         """Lexically detect a value-control target (e.g., brightness/contrast) from config.
 
         Returns (best_target_name, matched_names)
         """
-        cfg = load_config()
-        entity_cfg = cfg.get("entities", {}).get("entities", [])
-        text_lower = text.lower()
-        matches: List[str] = []
-
-        # Build candidate list: only entities with type==value
-        candidates: List[Tuple[str, List[str]]] = []
-        for e in entity_cfg:
-            if e.get("type") == "value":
-                name = e.get("name", "")
-                syns = [s.lower() for s in e.get("synonyms", [])]
-                candidates.append((name, syns))
-
-        for name, syns in candidates:
-            if name and name in text_lower:
-                matches.append(name)
-                continue
-            for s in syns:
-                if s and s in text_lower:
+        if text_lower is None:
+            text_lower = text.lower()
+        matches: List[str]
+
+        if self._value_automaton is not None:
+            # One pass over the text; report hits in config order, deduplicated
+            hits = {hit for _, owners in self._value_automaton.iter(text_lower) for hit in owners}
+            matches = [name for _, name in sorted(hits)]
+        else:
+            matches = []
+            for name, syns in self._value_terms:
+                if name and name in text_lower:
                     matches.append(name)
-                    break
+                    continue
+                for s in syns:
+                    if s and s in text_lower:
+                        matches.append(name)
+                        break
 
         # Deduplicate while preserving order
-        seen = set()
-        matches = [m for m in matches if not (m in seen or seen.add(m))]
+        matches = list(dict.fromkeys(matches))
 
         if len(matches) == 1:
             return matches[0], matches
         else:
             return None, matches
     
-    def _fuzzy_intent_match(self, text: str) -> Tuple[str, float]:
-        """Fuzzy matching fallback for typos and variations."""
-        try:
-            from rapidfuzz.fuzz import partial_ratio
-            
-            text_lower = text.lower()
-            
-            # Common patterns - prioritize info questions over control actions
-            control_patterns = {
-                "info_definition": [
-                    "what is", "what are", "definition", "tell me about", "information",
-                    "wat is", "wat are", "definiton", "infomation"
-                ],
-                "info_location": [
-                    "where is", "where are", "which side", "what side",
-                    "were is", "were are", "wich side", "wat side"
-                ],
-                "control_on": [
-                    "turn on", "activate", "enable", "switch on", "start", "show", 
-                    "give me", "provide me", "bring up", "turnn on", "tirn on",
-                    "turnn", "tirn", "activat", "enabl", "swich on"
-                ],
-                "control_off": [
-                    "turn off", "deactivate", "disable", "switch off", "stop", "hide",
-                    "turnn off", "tirn off", "deactivat", "disabl", "swich off"
-                ]
-            }
-            
-            best_match = "none"
-            best_score = 0.0
-            
-            for intent, patterns in control_patterns.items():
-                for pattern in patterns:
-                    if pattern in text_lower:
-                        # Calculate fuzzy score for the pattern
-                        score = partial_ratio(pattern, text_lower) / 100.0
-                        
-                        # Boost info patterns to prioritize them over control patterns
-                        if intent.startswith("info_"):
-                            score = min(score + 0.3, 1.0)
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_match = intent
-            
-            # Boost confidence for exact matches
-            if best_score > 0.8:
-                best_score = min(best_score + 0.2, 1.0)
-            
-            return best_match, best_score
-            
-        except ImportError:
-            # Fallback to simple pattern matching
+    def _fuzzy_intent_match(self, text: str, text_lower: Optional[str] = None) -> Tuple[str, float]:
+        """Keyword fallback for typos and variations (typo variants are listed explicitly)."""
+        if text_lower is None:
             text_lower = text.lower()
-            
-            if any(word in text_lower for word in ["turn on", "activate", "enable", "show", "start"]):
-                return "control_on", 0.6
-            elif any(word in text_lower for word in ["turn off", "deactivate", "disable", "hide", "stop"]):
-                return "control_off", 0.6
-            elif any(word in text_lower for word in ["what is", "what are", "definition"]):
-                return "info_definition", 0.6
-            elif any(word in text_lower for word in ["where is", "where are", "which side"]):
-                return "info_location", 0.6
-            
-            return "none", 0.0
-        except Exception as e:
-            print(f"Warning: Fuzzy matching failed: {e}")
-            return "none", 0.0
+        
+        # Only verbatim hits were ever scored, and partial_ratio of a substring is
+        # always 100, so the first intent (in priority order) with a hit wins outright
+        for intent, patterns in _CONTROL_PATTERNS.items():
+            if any(pattern in text_lower for pattern in patterns):
+                return intent, 1.0
+        
+        return "none", 0.0
 
     def _llm_classify(self, text: str) -> Tuple[str, float]:
         """LLM-based intent classification as tie-breaker."""
         try:
-            from app.llm.ollama_client import OllamaClient
-            client = OllamaClient()
-            
-            # Get allowed labels from config
-            config = self._get_config()
-            labels = config.get("classifier", {}).get("labels", [])
-            label_prompts = config.get("classifier", {}).get("label_prompts", {})
+            if not _OLLAMA_AVAILABLE:
+                return "none", 0.0
+            client = _get_ollama()
             
-            # Create constrained prompt
-            prompt = f"""Classify this user input into one of these exact labels: {', '.join(labels)}
-
-User input: "{text}"
-
-Respond with only the label name (e.g., "control_on", "info_definition", etc.). No explanation."""
-
-            response = client.chat(prompt)
-            response = response.strip().lower()
+            # Constrained prompt over the allowed labels (built once at config load).
+            # One prompt per request: never mix different users' text in one prompt
+            prompt = self._llm_prompt_template.format(text=text)
+            response = client.chat([{"role": "user", "content": prompt}])
+            label = response.strip().lower()
             
             # Check if response is a valid label
-            if response in labels:
-                return response, 0.7  # Medium confidence for LLM
+            if label in self._label_set:
+                return label, 0.7  # Medium confidence for LLM
             else:
                 return "none", 0.0
                 
         except Exception as e:
-            print(f"Warning: LLM classification failed: {e}")
+            logger.warning("LLM classification failed: %s", e)
             return "none", 0.0
     
     def _generate_clarification(
@@ -354,87 +459,41 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
         text: str,
         intent_label: str,
         intent_conf: float,
-        entity: Optional[Tuple],
+        entity: Optional[Entity],
         entity_conf: float,
         value_result: Optional[Tuple],
         value_conf: float,
-        entity_candidates: List[Tuple[str, float, Dict[str, Any]]],
+        entity_candidates: List[Entity],
     ) -> Dict[str, Any]:
         """Generate context-aware clarification suggestions based on input and candidates."""
         clarifications: List[str] = []
-        text_lower = text.lower()
         detected_value = None
         if value_result:
             detected_value = value_result[0]
 
-        # Load entities/ranges for targeted suggestions
-        try:
-            cfg = load_config()
-            entity_cfg = cfg.get("entities", {}).get("entities", [])
-            ranges_cfg = cfg.get("ranges", {})
-        except Exception:
-            entity_cfg, ranges_cfg = [], {}
-
-        # Build helpful suggestion lists
-        switch_targets = [e for e in entity_cfg if e.get("type") == "switch"]
-        value_targets = [e for e in entity_cfg if e.get("type") == "value"]
-
-        # 1) If a numeric value is present but entity is unclear → ask which control to apply it to
-        if detected_value is not None and (entity is None or entity_conf < 0.5):
-            options = []
-            for e in value_targets:
-                name = e.get("name", "")
-                r = ranges_cfg.get(name, {})
-                r_min = r.get("min")
-                r_max = r.get("max")
-                if r_min is not None and r_max is not None:
-                    options.append(f"{name} ({r_min}–{r_max})")
-                else:
-                    options.append(name)
-            if options:
-                clarifications.append(
-                    f"I detected value {detected_value}. Which control should I apply it to? (e.g., {', '.join(options[:4])})"
-                )
-
-        # 2) If control intent (on/off/toggle) and entity is unclear → suggest top candidates + common switches
-        if intent_label in ("control_on", "control_off") and (entity is None or entity_conf < 0.5):
-            candidate_names = []
-            for n, c, d in entity_candidates[:5]:
-                canonical = d.get("name", n)
-                if canonical not in candidate_names:
-                    candidate_names.append(canonical)
-            # Add common switches if we have room
-            for e in switch_targets:
-                nm = e.get("name", "")
-                if nm and nm not in candidate_names:
-                    candidate_names.append(nm)
-                if len(candidate_names) >= 5:
-                    break
-            if candidate_names:
-                clarifications.append(
-                    f"Which element should I {'turn on' if intent_label=='control_on' else 'turn off'}? (e.g., {', '.join(candidate_names[:5])})"
-                )
-
-        # 3) If info intent and entity unclear → suggest top entity candidates
-        if intent_label in ("info_definition", "info_location") and (entity is None or entity_conf < 0.5):
-            candidate_names = []
-            for n, c, d in entity_candidates[:5]:
-                canonical = d.get("name", n)
-                if canonical not in candidate_names:
-                    candidate_names.append(canonical)
-            if candidate_names:
-                what = "definition" if intent_label == "info_definition" else "location"
-                clarifications.append(
-                    f"Whose {what} do you want? (e.g., {', '.join(candidate_names[:5])})"
-                )
-
-        # 4) If intent confidence is low → ask a light, non-intrusive nudge rather than generic patterns
+        if entity is None or entity_conf < 0.5:
+            # 1) If a numeric value is present but entity is unclear → ask which control to apply it to
+            if detected_value is not None:
+                options = [self._format_range(e.get("name", "")) for e in self._value_targets]
+                if options:
+                    clarifications.append(
+                        f"I detected value {detected_value}. Which control should I apply it to? (e.g., {', '.join(options[:4])})"
+                    )
+
+            # 2) Control on/off or info intent with an unclear entity → intent-specific candidate list
+            suggest = self._clarify_by_intent.get(intent_label)
+            if suggest is not None:
+                suggestion = suggest(intent_label, entity_candidates)
+                if suggestion:
+                    clarifications.append(suggestion)
+
+        # 3) If intent confidence is low → ask a light, non-intrusive nudge rather than generic patterns
         if intent_conf < 0.6 and not clarifications:
             clarifications.append(
                 "I can help with controls (turn on/off, set values) or info (what/where). What would you like to do?"
             )
 
-        # 5) If nothing specific generated, provide a minimal fallback clarification
+        # 4) If nothing specific generated, provide a minimal fallback clarification
         if not clarifications:
             clarifications.append("Could you specify the element or value?")
 
@@ -449,7 +508,35 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
             },
         }
     
-    def _generate_control_action(self, intent_label: str, entity: Optional[Tuple], 
+    def _clarify_switch_target(
+        self, intent_label: str, entity_candidates: List[Entity]
+    ) -> Optional[str]:
+        """Suggest top candidates plus common switches for an on/off request."""
+        # dict keys: order-preserving dedup
+        names = dict.fromkeys(e.canonical for e in entity_candidates[:5])
+        # Add common switches if we have room
+        for e in self._switch_targets:
+            nm = e.get("name", "")
+            if nm and nm not in names:
+                names[nm] = None
+            if len(names) >= 5:
+                break
+        if not names:
+            return None
+        verb = "turn on" if intent_label == "control_on" else "turn off"
+        return f"Which element should I {verb}? (e.g., {', '.join(list(names)[:5])})"
+    
+    def _clarify_info_target(
+        self, intent_label: str, entity_candidates: List[Entity]
+    ) -> Optional[str]:
+        """Suggest top entity candidates for a definition/location question."""
+        candidate_names = list(dict.fromkeys(e.canonical for e in entity_candidates[:5]))
+        if not candidate_names:
+            return None
+        what = "definition" if intent_label == "info_definition" else "location"
+        return f"Whose {what} do you want? (e.g., {', '.join(candidate_names)})"
+    
+    def _generate_control_action(self, intent_label: str, entity: Optional[Entity], 
                                 value_result: Optional[Tuple], text: str) -> Dict[str, Any]:
         """Generate control tool action."""
         if not entity:
@@ -459,9 +546,9 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
                 "clarifications": ["Please specify the target (e.g., 'handles', 'implants', 'x-ray')"]
             }
         
-        entity_name, entity_conf, entity_data = entity
+        entity_conf, entity_data = entity.conf, entity.data
         entity_type = entity_data.get("type", "unknown")
-        canonical_target = entity_data.get("name", entity_name)
+        canonical_target = entity.canonical
         
         # Determine operation and value
         operation = "toggle"
@@ -478,15 +565,10 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
             value, _ = value_result
         elif intent_label == "control_value" and not value_result:
             # Missing numeric value → ask a targeted value clarification using ranges for this control
-            try:
-                cfg = load_config()
-                ranges_cfg = cfg.get("ranges", {})
-                r = ranges_cfg.get(canonical_target, {})
-                r_min = r.get("min")
-                r_max = r.get("max")
-                range_hint = f" ({r_min}–{r_max})" if r_min is not None and r_max is not None else ""
-            except Exception:
-                range_hint = ""
+            r = self._ranges_cfg.get(canonical_target, {})
+            r_min = r.get("min")
+            r_max = r.get("max")
+            range_hint = f" ({r_min}–{r_max})" if r_min is not None and r_max is not None else ""
             return {
                 "type": "clarification",
                 "message": f"What value should I set for {canonical_target}{range_hint}?",
@@ -522,7 +604,7 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
             }
         }
     
-    def _generate_info_response(self, intent_label: str, entity: Optional[Tuple], text: str) -> Dict[str, Any]:
+    def _generate_info_response(self, intent_label: str, entity: Optional[Entity], text: str) -> Dict[str, Any]:
         """Generate information response."""
         if not entity:
             return {
@@ -531,12 +613,10 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
                 "clarifications": ["Please specify the element (e.g., 'handles', 'implants', 'x-ray')"]
             }
         
-        entity_name, entity_conf, entity_data = entity
-        canonical_name = entity_data.get("name", entity_name)  # Use canonical name from entity data
+        entity_name, entity_conf, entity_data, canonical_name = entity
         
         if intent_label == "info_definition":
             # Try to get definition from the definitions resolver first
-            from app.scene.defs import resolve_definition
             definition = resolve_definition(text)
             
             if definition:
@@ -547,8 +627,10 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
                     "confidence": entity_conf
                 }
             else:
-                # Fallback to entity data or generic message
-                definition = entity_data.get("definition", f"{canonical_name} is a VR scene element.")
+                # Fallback to entity data or generic message (built only on a miss)
+                definition = entity_data.get("definition")
+                if definition is None:
+                    definition = f"{canonical_name} is a VR scene element."
                 return {
                     "type": "answer",
                     "answer": definition,
@@ -556,7 +638,9 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
                     "confidence": entity_conf
                 }
         elif intent_label == "info_location":
-            location = entity_data.get("location", f"{entity_name} location is not specified.")
+            location = entity_data.get("location")
+            if location is None:
+                location = f"{entity_name} location is not specified."
             return {
                 "type": "answer", 
                 "answer": location,
@@ -573,32 +657,49 @@ Respond with only the label name (e.g., "control_on", "info_definition", etc.).
     
     def _generate_fallback_response(self, text: str) -> Dict[str, Any]:
         """Generate fallback response for unclear input."""
-        return {
-            "type": "clarification",
-            "message": "I'm not sure what you're asking for.",
-            "clarifications": [
-                "Try asking about scene elements (e.g., 'what are handles?')",
-                "Try control commands (e.g., 'turn on x-ray')",
-                "Try location questions (e.g., 'where is the skull?')"
-            ]
-        }
+        return {**_FALLBACK_RESPONSE, "clarifications": list(_FALLBACK_RESPONSE["clarifications"])}
     
     def _generate_size_request_response(self, text: str) -> Dict[str, Any]:
         """Generate size request clarification."""
         return {
-            "type": "clarification",
-            "message": "Which size for implants?",
-            "clarifications": [
-                "Provide height_y_mm (3.0–4.8) and length_z_mm (6–17)",
-                "Example: 'give me implant size 4 x 11.5'"
-            ],
-            "confidence": {
-                "intent": 0.8,
-                "entity": 0.0,
-                "value": 0.0
-            }
+            **_SIZE_REQUEST_RESPONSE,
+            "clarifications": list(_SIZE_REQUEST_RESPONSE["clarifications"]),
+            "confidence": dict(_SIZE_REQUEST_CONFIDENCE),
         }
 
 
-# Global instance
-decision_router = DecisionRouter()
\ No newline at end of file
+# Global instance, built on first get_decision_router() call
+_decision_router: Optional[DecisionRouter] = None
+_decision_router_lock = threading.Lock()
+
+
+def get_decision_router() -> DecisionRouter:
+    global _decision_router
+    if _decision_router is None:
+        with _decision_router_lock:
+            if _decision_router is None:
+                _decision_router = DecisionRouter()
+    return _decision_router
+
+
+def reload_config() -> None:
+    """Re-read config/*.json and drop every cache built from it.
+
+    Covers load_config(), the control tool's targets and ranges, the classifier's
+    label embeddings, the numeric parser's ranges, the entity resolver's index and
+    the shared router. Singletons that haven't been built yet are left alone.
+    """
+    load_config.cache_clear()
+    reset_control_cache()
+    classifier.reload()
+    numeric_parser.reload()
+    reload_entity_resolver()
+    if _decision_router is not None:
+        _decision_router._load()
+
+
+def __getattr__(name: str):
+    # Keeps `from ... import decision_router` working for scripts; that import builds it
+    if name == "decision_router":
+        return get_decision_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
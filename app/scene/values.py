@@ -5,6 +5,16 @@ from typing import Any, Dict, List, Tuple, Optional, Union
 from app.config_loader import load_config
 
 
+# Compiled once; every pattern needs a digit, so _DIGIT_RE doubles as a cheap pre-check
+_DIGIT_RE = re.compile(r'\d')
+_PERCENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_NUMBER_RE = re.compile(r'\b(\d+(?:\.\d+)?)\b')
+_DIMENSION_RE = re.compile(r'(\d+(?:\.\d+)?)\s*[x×]\s*(\d+(?:\.\d+)?)')
+_HEIGHT_RE = re.compile(r'height[:\s]*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_LENGTH_RE = re.compile(r'length[:\s]*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_SINGLE_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+
 class NumericParser:
     """Parse numeric values and sizes from text."""
     
@@ -18,24 +28,30 @@ class NumericParser:
             self._config = config.get("ranges", {})
         return self._config
     
-    def parse_brightness_contrast(self, text: str) -> Optional[Tuple[float, float]]:
+    def reload(self):
+        """Drop the cached ranges config; the next parse re-reads it."""
+        self._config = None
+    
+    def parse_brightness_contrast(self, text: str, text_lower: Optional[str] = None) -> Optional[Tuple[float, float]]:
         """
         Parse brightness or contrast values from text.
         Returns (value, confidence) or None if not found.
         """
+        if text_lower is None:
+            text_lower = text.lower()
+        
         # Look for percentage patterns
-        percentage_pattern = r'(\d+(?:\.\d+)?)\s*%'
-        matches = re.findall(percentage_pattern, text)
+        match = _PERCENT_RE.search(text)
         
-        if matches:
+        if match:
             try:
-                value = float(matches[0])
+                value = float(match.group(1))
                 ranges = self._get_config()
                 
                 # Check if it's brightness or contrast
-                if 'brightness' in text.lower():
+                if 'brightness' in text_lower:
                     target_range = ranges.get('brightness', {'min': 0, 'max': 100})
-                elif 'contrast' in text.lower():
+                elif 'contrast' in text_lower:
                     target_range = ranges.get('contrast', {'min': 0, 'max': 100})
                 else:
                     target_range = {'min': 0, 'max': 100}
@@ -52,17 +68,16 @@ class NumericParser:
                 pass
         
         # Look for simple numbers
-        number_pattern = r'\b(\d+(?:\.\d+)?)\b'
-        matches = re.findall(number_pattern, text)
+        match = _NUMBER_RE.search(text)
         
-        if matches:
+        if match:
             try:
-                value = float(matches[0])
+                value = float(match.group(1))
                 ranges = self._get_config()
                 
-                if 'brightness' in text.lower():
+                if 'brightness' in text_lower:
                     target_range = ranges.get('brightness', {'min': 0, 'max': 100})
-                elif 'contrast' in text.lower():
+                elif 'contrast' in text_lower:
                     target_range = ranges.get('contrast', {'min': 0, 'max': 100})
                 else:
                     target_range = {'min': 0, 'max': 100}
@@ -89,8 +104,7 @@ class NumericParser:
         length_range = implant_ranges.get('length_z_mm', {'min': 6.0, 'max': 17.0})
         
         # Pattern for "4 x 11.5" format
-        dimension_pattern = r'(\d+(?:\.\d+)?)\s*[x×]\s*(\d+(?:\.\d+)?)'
-        match = re.search(dimension_pattern, text)
+        match = _DIMENSION_RE.search(text)
         
         if match:
             try:
@@ -108,11 +122,8 @@ class NumericParser:
                 pass
         
         # Pattern for "height 4.2 length 12" format
-        height_pattern = r'height[:\s]*(\d+(?:\.\d+)?)'
-        length_pattern = r'length[:\s]*(\d+(?:\.\d+)?)'
-        
-        height_match = re.search(height_pattern, text, re.IGNORECASE)
-        length_match = re.search(length_pattern, text, re.IGNORECASE)
+        height_match = _HEIGHT_RE.search(text)
+        length_match = _LENGTH_RE.search(text)
         
         if height_match and length_match:
             try:
@@ -128,12 +139,11 @@ class NumericParser:
                 pass
         
         # Pattern for single values with context
-        single_pattern = r'(\d+(?:\.\d+)?)'
-        matches = re.findall(single_pattern, text)
+        match = _SINGLE_RE.search(text)
         
-        if matches:
+        if match:
             try:
-                value = float(matches[0])
+                value = float(match.group(1))
                 
                 # If it's in height range, assume it's height
                 if height_range['min'] <= value <= height_range['max']:
@@ -147,13 +157,20 @@ class NumericParser:
         
         return None
     
-    def parse_value(self, text: str, target_type: str = "auto") -> Optional[Tuple[Union[float, Dict[str, float]], float]]:
+    def parse_value(
+        self, text: str, target_type: str = "auto", text_lower: Optional[str] = None
+    ) -> Optional[Tuple[Union[float, Dict[str, float]], float]]:
         """
         Parse any numeric value from text.
         Returns (value, confidence) or None if not found.
+        Callers that already lowercased the text can pass it as text_lower.
         """
+        # No digit, nothing any of the patterns below could match
+        if not _DIGIT_RE.search(text):
+            return None
+        
         if target_type == "brightness" or target_type == "contrast":
-            result = self.parse_brightness_contrast(text)
+            result = self.parse_brightness_contrast(text, text_lower)
             if result:
                 return result
         
@@ -169,7 +186,7 @@ class NumericParser:
                 return implant_result
             
             # Then try brightness/contrast
-            brightness_result = self.parse_brightness_contrast(text)
+            brightness_result = self.parse_brightness_contrast(text, text_lower)
             if brightness_result:
                 return brightness_result
         
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
+
+
+_RESPONSE_TYPES = frozenset({'tool_action', 'answer', 'clarification'})
+_HANDS = frozenset({'left', 'right', 'none'})
+_OPERATIONS = frozenset({'set', 'toggle'})
 
 
 # Request schemas for API endpoints
@@ -9,6 +15,10 @@ class ChatRequest(BaseModel):
     """Schema for chat API requests."""
     message: str = Field(description="User message")
     sessionId: str = Field(description="Session ID")
+    conversation_history: Optional[List[Dict[str, str]]] = Field(
+        default=None,
+        description="Prior turns as {role, content}; only used to bootstrap a new session",
+    )
 
 
 class IngestRequest(BaseModel):
@@ -70,29 +80,24 @@ class ChatResponse(BaseModel):
     clarifications: Optional[List[str]] = Field(default=None, description="Clarification questions (for clarification)")
     confidence: Optional[Union[float, Dict[str, float]]] = Field(default=None, description="Confidence scores")
     
-    @validator('type')
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator('type')
+    @classmethod
     def validate_type(cls, v):
-        if v not in ['tool_action', 'answer', 'clarification']:
+        if v not in _RESPONSE_TYPES:
             raise ValueError('type must be tool_action, answer, or clarification')
         return v
     
-    @validator('tool')
-    def validate_tool(cls, v, values):
-        if values.get('type') == 'tool_action' and not v:
+    @model_validator(mode='after')
+    def validate_required_for_type(self):
+        if self.type == 'tool_action' and not self.tool:
             raise ValueError('tool is required for tool_action type')
-        return v
-    
-    @validator('answer')
-    def validate_answer(cls, v, values):
-        if values.get('type') == 'answer' and not v:
+        if self.type == 'answer' and not self.answer:
             raise ValueError('answer is required for answer type')
-        return v
-    
-    @validator('message')
-    def validate_message(cls, v, values):
-        if values.get('type') == 'clarification' and not v:
+        if self.type == 'clarification' and not self.message:
             raise ValueError('message is required for clarification type')
-        return v
+        return self
 
 
 class ControlArguments(BaseModel):
@@ -102,46 +107,124 @@ class ControlArguments(BaseModel):
     operation: str = Field(description="Operation: set or toggle")
     value: Optional[Union[str, float, Dict[str, float]]] = Field(default=None, description="Value to set")
     
-    @validator('hand')
+    model_config = ConfigDict(frozen=True)
+    
+    @field_validator('hand')
+    @classmethod
     def validate_hand(cls, v):
-        if v not in ['left', 'right', 'none']:
+        if v not in _HANDS:
             raise ValueError('hand must be left, right, or none')
         return v
     
-    @validator('operation')
+    @field_validator('operation')
+    @classmethod
     def validate_operation(cls, v):
-        if v not in ['set', 'toggle']:
+        if v not in _OPERATIONS:
             raise ValueError('operation must be set or toggle')
         return v
 
 
+_CONTROL_ARGUMENTS_ADAPTER = TypeAdapter(ControlArguments)
+
+
+# Router responses are built by our own code, so they are checked against the
+# response schemas above with plain type tests instead of a Pydantic round-trip.
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _check_confidence_map(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    if not isinstance(v, dict) or not all(isinstance(k, str) and _is_number(c) for k, c in v.items()):
+        return "confidence must be a mapping of scores"
+    return None
+
+
+def _check_tool_action(response: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(response.get('tool'), str):
+        return "tool must be a string"
+    if not isinstance(response.get('arguments'), dict):
+        return "arguments must be an object"
+    return _check_confidence_map(response.get('confidence'))
+
+
+def _check_answer(response: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(response.get('answer'), str):
+        return "answer must be a string"
+    if not isinstance(response.get('context_used'), bool):
+        return "context_used must be a boolean"
+    confidence = response.get('confidence')
+    if confidence is not None and not _is_number(confidence):
+        return "confidence must be a number"
+    return None
+
+
+def _check_clarification(response: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(response.get('message'), str):
+        return "message must be a string"
+    clarifications = response.get('clarifications')
+    if not isinstance(clarifications, list) or not all(isinstance(c, str) for c in clarifications):
+        return "clarifications must be a list of strings"
+    return _check_confidence_map(response.get('confidence'))
+
+
+_RESPONSE_CHECKS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    'tool_action': _check_tool_action,
+    'answer': _check_answer,
+    'clarification': _check_clarification,
+}
+# Declared fields and their defaults per type, so a checked response has the
+# same keys model_dump() gave: defaults filled in, undeclared keys dropped
+_RESPONSE_FIELDS: Dict[str, Tuple[Tuple[str, Any], ...]] = {
+    response_type: tuple((name, field.default) for name, field in model.model_fields.items())
+    for response_type, model in (
+        ('tool_action', ToolAction),
+        ('answer', AnswerResponse),
+        ('clarification', ClarificationResponse),
+    )
+}
+
+
 def validate_response(response: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Validate and normalize response using Pydantic schemas.
-    Returns validated response or error details.
+    Validate a router response against the response schemas.
+    Returns the schema's fields (defaults included) when valid, otherwise error details.
     """
-    try:
-        if response.get('type') == 'tool_action':
-            validated = ToolAction(**response)
-        elif response.get('type') == 'answer':
-            validated = AnswerResponse(**response)
-        elif response.get('type') == 'clarification':
-            validated = ClarificationResponse(**response)
-        else:
-            return {"error": "Invalid response type", "original": response}
-        
-        return validated.dict()
-    except Exception as e:
-        return {"error": f"Validation failed: {str(e)}", "original": response}
+    response_type = response.get('type')
+    check = _RESPONSE_CHECKS.get(response_type)
+    if check is None:
+        return {"error": "Invalid response type", "original": response}
+    error = check(response)
+    if error is not None:
+        return {"error": f"Validation failed: {error}", "original": response}
+    # Required fields are present once the check passes
+    return {name: response.get(name, default) for name, default in _RESPONSE_FIELDS[response_type]}
+
+
+@lru_cache(maxsize=1024)
+def _validate_control_items(items: frozenset) -> Dict[str, Any]:
+    # Failures raise, and lru_cache does not cache exceptions
+    validated = _CONTROL_ARGUMENTS_ADAPTER.validate_python({key: value for key, _, value in items})
+    return _CONTROL_ARGUMENTS_ADAPTER.dump_python(validated)
 
 
 def validate_control_arguments(args: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate control tool arguments.
     Returns validated arguments or error details.
+
+    Repeated commands (e.g. "turn on nerve overlay") hit an LRU cache keyed
+    on the argument items and their types; unhashable values such as implant
+    size dicts are validated directly. Errors are never cached.
     """
     try:
-        validated = ControlArguments(**args)
-        return validated.dict()
+        try:
+            # type(value) keeps True, 1 and 1.0 apart: they hash alike but validate differently
+            key = frozenset((name, type(value), value) for name, value in args.items())
+        except TypeError:
+            validated = _CONTROL_ARGUMENTS_ADAPTER.validate_python(args)
+            return _CONTROL_ARGUMENTS_ADAPTER.dump_python(validated)
+        return dict(_validate_control_items(key))
     except Exception as e:
-        return {"error": f"Control validation failed: {str(e)}", "original": args}
\ No newline at end of file
+        return {"error": f"Control validation failed: {str(e)}", "original": args}
@@ -1,51 +1,142 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Optional, Tuple
 from app.config_loader import load_config
 
 
 ALLOWED_HANDS = {"left", "right", "none"}
 
+ValidationResult = Tuple[bool, Optional[str], Optional[Dict[str, Any]]]
 
+# Implant size bounds (min, max) in mm when config/ranges.json doesn't set them
+_DEFAULT_HEIGHT = (3.0, 4.8)
+_DEFAULT_LENGTH = (6.0, 17.0)
+
+
+@lru_cache(maxsize=1)
 def _get_ranges() -> Dict[str, Any]:
-    """Load ranges from config."""
+    """Load ranges from config (cached; see reset_cache)."""
     config = load_config()
     return config.get("ranges", {})
 
 
+@lru_cache(maxsize=1)
 def _get_entities() -> Dict[str, Any]:
-    """Load entities from config."""
+    """Switch/value target name sets from config (cached; see reset_cache)."""
     config = load_config()
     entities = config.get("entities", {}).get("entities", [])
     
-    switch_targets = set()
-    value_targets = set()
-    
+    # One pass: group entity names by type
+    groups: Dict[str, set] = {}
     for entity in entities:
-        entity_type = entity.get("type", "")
-        name = entity.get("name", "")
-        
-        if entity_type == "switch":
-            switch_targets.add(name)
-        elif entity_type == "control":
-            value_targets.add(name)
+        groups.setdefault(entity.get("type", ""), set()).add(entity.get("name", ""))
     
+    # Frozen: the cached sets are shared by every call
+    switch_targets = frozenset(groups.get("switch", ()))
+    value_targets = frozenset(groups.get("control", ()))
     return {
         "switch_targets": switch_targets,
-        "value_targets": value_targets
+        "value_targets": value_targets,
+        "controlled_targets": switch_targets | value_targets,
+    }
+
+
+def reset_cache() -> None:
+    """Forget cached ranges/targets; app.scene.router.reload_config() calls this."""
+    _get_ranges.cache_clear()
+    _get_entities.cache_clear()
+    _get_dispatch.cache_clear()
+
+
+def _validate_switch(normalized: Dict[str, Any], value: Any) -> ValidationResult:
+    if normalized["operation"] == "set":
+        if value not in {"on", "off"}:
+            return False, "value must be 'on' or 'off'", None
+        normalized["value"] = value
+    else:  # toggle
+        normalized["value"] = "toggle"
+    return True, None, normalized
+
+
+def _make_value_validator(min_val: float, max_val: float) -> Callable[[Dict[str, Any], Any], ValidationResult]:
+    """Validator for one value target with its config range baked in."""
+    return partial(_validate_value, min_val, max_val)
+
+
+def _validate_value(min_val: float, max_val: float, normalized: Dict[str, Any], value: Any) -> ValidationResult:
+    # Type check stays: float() alone would also accept numeric strings like "50"
+    if not isinstance(value, (int, float)):
+        return False, "value must be a number", None
+    
+    number = float(value)
+    if not (min_val <= number <= max_val):
+        return False, f"value out of range ({min_val}-{max_val})", None
+    normalized["value"] = number
+    return True, None, normalized
+
+
+def _implant_bounds(ranges: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """(h_min, h_max, l_min, l_max) from the implants block of the ranges config."""
+    implant_ranges = ranges.get("implants", {})
+    height = implant_ranges.get("height_y_mm")
+    length = implant_ranges.get("length_z_mm")
+    h_min, h_max = (height["min"], height["max"]) if height is not None else _DEFAULT_HEIGHT
+    l_min, l_max = (length["min"], length["max"]) if length is not None else _DEFAULT_LENGTH
+    return h_min, h_max, l_min, l_max
+
+
+def _validate_implants(
+    h_min: Any, h_max: Any, l_min: Any, l_max: Any, normalized: Dict[str, Any], value: Any
+) -> ValidationResult:
+    # Allow either on/off or sizing object
+    if isinstance(value, str):
+        if value not in {"on", "off"}:
+            return False, "implants value must be 'on' or 'off' or size object", None
+        normalized["value"] = value
+        return True, None, normalized
+    if isinstance(value, dict):
+        # Only these two keys are meaningful; anything else is dropped
+        size: Dict[str, float] = {}
+        h = value.get("height_y_mm")
+        if h is not None:
+            h = float(h)
+            if not (h_min <= h <= h_max):
+                return False, f"height_y_mm out of range ({h_min}-{h_max})", None
+            size["height_y_mm"] = h
+        l = value.get("length_z_mm")
+        if l is not None:
+            l = float(l)
+            if not (l_min <= l <= l_max):
+                return False, f"length_z_mm out of range ({l_min}-{l_max})", None
+            size["length_z_mm"] = l
+        normalized["value"] = size
+        return True, None, normalized
+    return False, "invalid implants value", None
+
+
+@lru_cache(maxsize=1)
+def _get_dispatch() -> Dict[str, Callable[[Dict[str, Any], Any], ValidationResult]]:
+    """Target name -> validator specialized with that target's config ranges.
+
+    Switch targets win over value targets, both over the implants special case.
+    """
+    entities = _get_entities()
+    ranges = _get_ranges()
+    dispatch: Dict[str, Callable[[Dict[str, Any], Any], ValidationResult]] = {
+        "implants": partial(_validate_implants, *_implant_bounds(ranges)),
     }
+    for target in entities["value_targets"]:
+        target_range = ranges.get(target, {"min": 0, "max": 100})
+        dispatch[target] = _make_value_validator(target_range.get("min", 0), target_range.get("max", 100))
+    dispatch.update(dict.fromkeys(entities["switch_targets"], _validate_switch))
+    return dispatch
 
 
-def _validate(args: Dict[str, Any]) -> tuple[bool, str | None, Dict[str, Any] | None]:
+def _validate(args: Dict[str, Any]) -> ValidationResult:
     hand = args.get("hand", "none")
     target = args.get("target")
     operation = args.get("operation")
-    value = args.get("value")
-    ranges = _get_ranges()
-    entities = _get_entities()
-    
-    switch_targets = entities["switch_targets"]
-    value_targets = entities["value_targets"]
 
     if hand not in ALLOWED_HANDS:
         return False, "invalid hand", None
@@ -55,58 +146,15 @@ def _validate(args: Dict[str, Any]) -> tuple[bool, str | None, Dict[str, Any] |
         return False, "operation must be 'set' or 'toggle'", None
 
     # Enforce controller constraint: left hand cannot control implants/menu
-    if hand == "left" and target in (switch_targets | value_targets):
+    if hand == "left" and target in _get_entities()["controlled_targets"]:
         if target != "skull_model":
             return False, "left hand cannot control this target", None
 
+    validator = _get_dispatch().get(target)
+    if validator is None:
+        return False, "unknown target", None
     normalized: Dict[str, Any] = {"hand": hand, "target": target, "operation": operation}
-
-    if target in switch_targets:
-        if operation == "set":
-            if value not in {"on", "off"}:
-                return False, "value must be 'on' or 'off'", None
-            normalized["value"] = value
-        else:  # toggle
-            normalized["value"] = "toggle"
-        return True, None, normalized
-
-    if target in value_targets:
-        if not isinstance(value, (int, float)):
-            return False, "value must be a number", None
-        
-        # Use ranges from config
-        target_range = ranges.get(target, {"min": 0, "max": 100})
-        min_val = target_range.get("min", 0)
-        max_val = target_range.get("max", 100)
-        
-        if not (min_val <= float(value) <= max_val):
-            return False, f"value out of range ({min_val}-{max_val})", None
-        normalized["value"] = float(value)
-        return True, None, normalized
-
-    if target == "implants":
-        # Allow either on/off or sizing object
-        if isinstance(value, str):
-            if value not in {"on", "off"}:
-                return False, "implants value must be 'on' or 'off' or size object", None
-            normalized["value"] = value
-            return True, None, normalized
-        if isinstance(value, dict):
-            implant_ranges = ranges.get("implants", {})
-            height_range = implant_ranges.get("height_y_mm", {"min": 3.0, "max": 4.8})
-            length_range = implant_ranges.get("length_z_mm", {"min": 6.0, "max": 17.0})
-            
-            h = value.get("height_y_mm")
-            l = value.get("length_z_mm")
-            if h is not None and not (height_range["min"] <= float(h) <= height_range["max"]):
-                return False, f"height_y_mm out of range ({height_range['min']}-{height_range['max']})", None
-            if l is not None and not (length_range["min"] <= float(l) <= length_range["max"]):
-                return False, f"length_z_mm out of range ({length_range['min']}-{length_range['max']})", None
-            normalized["value"] = {k: float(v) for k, v in value.items() if k in {"height_y_mm", "length_z_mm"}}
-            return True, None, normalized
-        return False, "invalid implants value", None
-
-    return False, "unknown target", None
+    return validator(normalized, args.get("value"))
 
 
 def control_handler(args: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from typing import Any, Callable, Dict, Optional
 
 
@@ -10,6 +11,10 @@ class ToolError(Exception):
 class ToolRegistry:
     def __init__(self) -> None:
         self._tools: Dict[str, Dict[str, Any]] = {}
+        # name -> handler, bound at registration so execute is a single lookup
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+        # Rendered spec_for_prompt() text; reset whenever a tool is registered
+        self._prompt_cache: Optional[str] = None
 
     def register(self, name: str, description: str, schema: Dict[str, Any], handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
         self._tools[name] = {
@@ -18,19 +23,23 @@ class ToolRegistry:
             "schema": schema,
             "handler": handler,
         }
+        self._handlers[name] = handler
+        self._prompt_cache = None
 
     def spec_for_prompt(self) -> str:
-        # Minimal schema rendering for prompt context
-        specs = []
-        for tool in self._tools.values():
-            specs.append({"name": tool["name"], "description": tool["description"], "schema": tool["schema"]})
-        return str(specs)
+        # Minimal schema rendering for prompt context; compact JSON keeps the
+        # prompt prefix byte-stable across turns
+        if self._prompt_cache is None:
+            specs = []
+            for tool in self._tools.values():
+                specs.append({"name": tool["name"], "description": tool["description"], "schema": tool["schema"]})
+            self._prompt_cache = json.dumps(specs, separators=(",", ":"))
+        return self._prompt_cache
 
     def execute(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        tool = self._tools.get(name)
-        if not tool:
+        handler = self._handlers.get(name)
+        if handler is None:
             raise ToolError(f"Unknown tool: {name}")
-        handler = tool["handler"]
         return handler(arguments)
 
 
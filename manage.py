@@ -1,7 +1,7 @@
 import click
 from flask.cli import with_appcontext
 
-from app import create_app
+from app import create_app, warm_start
 from app.models import db, Document, Chunk
 from app.rag.chunker import split_text
 from app.llm.ollama_client import OllamaClient
@@ -66,7 +66,9 @@ app.cli.add_command(init_db_command)
 app.cli.add_command(ingest_text_command)
 
 if __name__ == "__main__":
-    # For development only
+    # For development only; serving, so load the models before the first request
+    if not app.config.get("WARM_START"):
+        warm_start(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
 
 
@@ -11,6 +11,16 @@ def test_try_parse_action_valid():
     assert act.arguments["name"] == "X"
 
 
+def test_try_parse_action_rejects_non_objects_with_either_decoder(monkeypatch):
+    from app.agent import parser
+
+    for decoder in (parser.orjson, None):
+        monkeypatch.setattr(parser, "orjson", decoder)
+        assert try_parse_action('noise {"tool": "t", "arguments": {"a": {"b": 1}}} noise').arguments == {"a": {"b": 1}}
+        assert try_parse_action("{not json}") is None
+        assert try_parse_action('{"tool": "t", "arguments": [1]}') is None
+
+
 class DummyClient:
     def chat(self, messages):
         # Emit a tool action in JSON
@@ -31,3 +41,38 @@ def test_agent_executes_tool(monkeypatch):
     assert out["type"] == "tool_result"
     assert out["tool"] == "activate_tool"
 
+
+
+def test_control_targets_cached_until_reset(monkeypatch):
+    from app.tools import control
+
+    config = {
+        "ranges": {"brightness": {"min": 0, "max": 100}},
+        "entities": {"entities": [{"name": "handles", "type": "switch"}, {"name": "brightness", "type": "control"}]},
+    }
+    monkeypatch.setattr(control, "load_config", lambda: config)
+    control.reset_cache()
+    try:
+        assert control.control_handler({"hand": "right", "target": "handles", "operation": "set", "value": "on"})["ok"]
+        assert not control.control_handler({"hand": "left", "target": "brightness", "operation": "set", "value": 50})["ok"]
+        assert control._get_entities() is control._get_entities()
+
+        config["entities"]["entities"] = []
+        assert control.control_handler({"hand": "right", "target": "handles", "operation": "toggle"})["ok"]
+        control.reset_cache()
+        assert control.control_handler({"hand": "right", "target": "handles", "operation": "toggle"})["error"] == "unknown target"
+    finally:
+        control.reset_cache()
+
+
+def test_spec_for_prompt_cached_until_register():
+    import json
+
+    reg = ToolRegistry()
+    reg.register("a", "first", {"type": "object"}, lambda args: {})
+    first = reg.spec_for_prompt()
+    assert reg.spec_for_prompt() is first
+    assert json.loads(first) == [{"name": "a", "description": "first", "schema": {"type": "object"}}]
+
+    reg.register("b", "second", {}, lambda args: {})
+    assert [spec["name"] for spec in json.loads(reg.spec_for_prompt())] == ["a", "b"]
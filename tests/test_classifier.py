@@ -0,0 +1,159 @@
+import numpy as np
+
+from app.scene.classifier import ZeroShotClassifier
+
+
+class _CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[1.0, 0.0]] * len(texts), dtype=np.float32)
+
+
+def _ready_classifier():
+    clf = ZeroShotClassifier()
+    clf._config = {"enabled": True}
+    clf._model = _CountingModel()
+    clf._enabled = True
+    clf._label_names = ["control_on", "info_definition"]
+    clf._label_embeddings = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    return clf
+
+
+def test_classify_memoizes_normalized_text():
+    clf = _ready_classifier()
+    assert clf.classify("Turn on  nerve") == ("control_on", 1.0)
+    assert clf.classify(" turn ON nerve ") == ("control_on", 1.0)
+    assert clf._model.calls == [["turn on nerve"]]
+
+    clf.clear_cache()
+    clf.classify("turn on nerve")
+    assert len(clf._model.calls) == 2
+
+
+def test_disabled_classifier_settles_once(monkeypatch):
+    clf = ZeroShotClassifier()
+    clf._config = {"enabled": False}
+    attempts = []
+    original = clf._ensure_model
+    monkeypatch.setattr(clf, "_ensure_model", lambda: attempts.append(1) or original())
+
+    assert clf.classify("turn on nerve") == ("none", 0.0)
+    assert clf.classify("turn off nerve") == ("none", 0.0)
+    assert attempts == [1]
+
+
+def test_backend_option_is_forwarded(monkeypatch):
+    import sys
+    import types
+
+    created = []
+
+    class FakeSentenceTransformer(_CountingModel):
+        def __init__(self, name, **kwargs):
+            super().__init__()
+            created.append((name, kwargs))
+
+    fake_module = types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer, __version__="3.2.1")
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    for version, backend, model_file, expected in [
+        ("3.2.1", "torch", None, {}),
+        ("3.2.1", "onnx", "onnx/model_qint8_avx512_vnni.onnx", {"backend": "onnx", "model_kwargs": {"file_name": "onnx/model_qint8_avx512_vnni.onnx"}}),
+        # Too old for backend=: falls back to torch instead of failing the load
+        ("3.0.1", "onnx", None, {}),
+    ]:
+        fake_module.__version__ = version
+        clf = ZeroShotClassifier()
+        clf._config = {"enabled": True, "model": "m", "backend": backend, "model_file": model_file, "label_prompts": {"control_on": "on"}}
+        clf._ensure_model()
+        assert clf._enabled
+        assert created[-1] == ("m", expected)
+
+
+def test_classify_batch_encodes_misses_once():
+    clf = _ready_classifier()
+    clf._model.encode = lambda texts, **kwargs: (
+        clf._model.calls.append(list(texts))
+        or np.array([[1.0, 0.0] if "on" in t else [0.0, 2.0] for t in texts], dtype=np.float32)
+    )
+    assert clf.classify("turn on nerve") == ("control_on", 1.0)
+    results = clf.classify_batch(["Turn on nerve", "what is the nerve", "what is  the nerve"])
+    assert results == [("control_on", 1.0), ("info_definition", 1.0), ("info_definition", 1.0)]
+    assert clf._model.calls == [["turn on nerve"], ["what is the nerve"]]
+
+
+def test_batch_window_coalesces_concurrent_classify():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    clf = _ready_classifier()
+    clf._config["batch_window_ms"] = 200
+    started = time.monotonic()
+    assert clf.classify("alone") == ("control_on", 1.0)
+    # A lone request doesn't wait out the window
+    assert time.monotonic() - started < 0.15
+
+    # Hold the first encode until the other three are queued behind it
+    entered, release = threading.Event(), threading.Event()
+    encode = clf._model.encode
+
+    def blocking_encode(texts, **kwargs):
+        if texts == ["a"]:
+            entered.set()
+            release.wait(5)
+        return encode(texts, **kwargs)
+
+    clf._model.encode = blocking_encode
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(clf.classify, "a")
+        assert entered.wait(5)
+        rest = [pool.submit(clf.classify, t) for t in ("b", "c", "d")]
+        while clf._batcher._queue.qsize() < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [first.result()] + [f.result() for f in rest]
+    assert results == [("control_on", 1.0)] * 4
+    assert clf._model.calls[1:] == [["a"], ["b", "c", "d"]]
+
+
+def test_similarity_buffer_reused_per_thread():
+    clf = _ready_classifier()
+    clf.classify("turn on nerve")
+    buf = clf._sims_local.buf
+    assert clf.classify_batch(["a", "b"]) == [("control_on", 1.0)] * 2
+    assert clf._sims_local.buf.shape == (2, 2)
+    clf.classify("turn off nerve")
+    assert clf._sims_local.buf is not buf and clf._sims_local.buf.shape[0] == 2
+
+
+def test_failed_model_load_is_retried_after_backoff(monkeypatch):
+    import sys
+    import types
+
+    from app.scene import classifier as classifier_module
+
+    clock = [100.0]
+    monkeypatch.setattr(classifier_module.time, "monotonic", lambda: clock[0])
+    attempts = []
+
+    class FlakySentenceTransformer(_CountingModel):
+        def __init__(self, name, **kwargs):
+            attempts.append(name)
+            if len(attempts) == 1:
+                raise OSError("connection reset while downloading")
+            super().__init__()
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=FlakySentenceTransformer))
+    clf = ZeroShotClassifier()
+    clf._config = {"enabled": True, "model": "m", "label_prompts": {"control_on": "on"}}
+
+    assert clf.classify("turn on nerve") == ("none", 0.0)
+    assert clf.classify("turn on nerve") == ("none", 0.0)
+    assert len(attempts) == 1
+
+    clock[0] += classifier_module._LOAD_RETRY_SECONDS
+    assert clf.classify("turn on nerve") == ("control_on", 1.0)
+    assert len(attempts) == 2
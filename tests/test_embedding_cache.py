@@ -0,0 +1,68 @@
+from app.embedding_cache import EmbeddingCache, embedding_cache
+from app.llm.ollama_client import OllamaClient
+
+
+class FakeResponse:
+    def __init__(self, vec):
+        self._vec = vec
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"embedding": self._vec}
+
+
+def test_embedding_cache_lru_eviction():
+    cache = EmbeddingCache(max_local=2)
+    cache.put("m", "a", [1.0, 0.0])
+    cache.put("m", "b", [0.0, 1.0])
+    assert cache.get("m", "a") == [1.0, 0.0]
+    cache.put("m", "c", [0.5, 0.5])
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0, 0.0]
+    assert cache.get("other", "a") is None
+
+
+def test_embed_only_calls_ollama_for_misses(monkeypatch):
+    embedding_cache.clear()
+    calls = []
+
+    def fake_post(url, json, timeout):
+        calls.append(json["prompt"])
+        return FakeResponse([float(len(json["prompt"])), 1.0])
+
+    client = OllamaClient(base_url="http://ollama.invalid")
+    monkeypatch.setattr(client.session, "post", fake_post)
+    first = client.embed(["turn on sinus overlay"], model="m")
+    second = client.embed(["hide nerve", "turn on sinus overlay"], model="m")
+    assert calls == ["turn on sinus overlay", "hide nerve"]
+    assert second[1] == first[0]
+    assert second[0] == [10.0, 1.0]
+
+
+def test_cache_hit_returns_the_stored_floats_exactly():
+    cache = EmbeddingCache()
+    vec = [0.1, 1 / 3, -2.718281828459045]
+    cache.put("m", "x", vec)
+    assert cache.get("m", "x") == vec
+    # float32 blobs from before the format change live under the old key
+    assert EmbeddingCache._key("m", "x").startswith("emb:v2:m:")
+
+
+def test_redis_failures_are_logged_once_per_interval(caplog):
+    class DeadRedis:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value, ex=None):
+            raise ConnectionError("down")
+
+    cache = EmbeddingCache()
+    cache._redis = DeadRedis()
+    with caplog.at_level("WARNING", logger="app.embedding_cache"):
+        cache.put("m", "x", [1.0])
+        assert cache.get("m", "x") == [1.0]
+        assert cache.get("m", "y") is None
+    assert len(caplog.records) == 1
+    assert "set failed" in caplog.records[0].getMessage()
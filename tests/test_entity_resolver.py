@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.scene import entity_resolver as er
+
+
+CONFIG = {
+    "entities": {
+        "entities": [
+            {"name": "skull_model", "synonyms": ["Skull", "dental model"]},
+            {"name": "xray_display", "synonyms": ["X-Ray", "xray"]},
+        ]
+    }
+}
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_lexical_overlap_uses_lowercased_candidates(monkeypatch, use_automaton):
+    monkeypatch.setattr(er, "load_config", lambda: CONFIG)
+    if not use_automaton:
+        monkeypatch.setattr(er, "ahocorasick", None)
+    resolver = er.SemanticEntityResolver()
+
+    names = [entity.name for entity in resolver.lexical_overlap("Show the X-RAY please")]
+    assert names == ["xray_display"]
+
+    simple = resolver._simple_lexical_overlap("hide skull_model and xray")
+    assert [(entity.name, entity.conf) for entity in simple] == [("skull_model", 1.0), ("xray_display", 0.8)]
+
+
+def test_reload_rebuilds_candidate_index(monkeypatch):
+    monkeypatch.setattr(er, "load_config", lambda: CONFIG)
+    resolver = er.SemanticEntityResolver()
+    first = resolver.lexical_overlap("skull")
+    assert first
+
+    # Memoized on normalized text until reload
+    resolver._fuzzy_overlap = lambda text: []
+    assert resolver.lexical_overlap("  SKULL ") == first
+    del resolver._fuzzy_overlap
+
+    monkeypatch.setattr(er, "load_config", lambda: {"entities": {"entities": []}})
+    resolver.reload()
+    assert resolver.lexical_overlap("skull") == []
+
+
+class _BagOfWordsModel:
+    """Tiny encode() double: one dimension per vocabulary word."""
+
+    vocab = ["skull", "model", "dental", "x-ray", "xray", "display"]
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        rows = np.array([[t.lower().count(w) for w in self.vocab] for t in texts], dtype=np.float32) + 0.01
+        if normalize_embeddings:
+            rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+        return rows
+
+
+@pytest.mark.parametrize("use_faiss", [True, False])
+def test_resolve_top_k(monkeypatch, use_faiss):
+    monkeypatch.setattr(er, "load_config", lambda: CONFIG)
+    if not use_faiss:
+        monkeypatch.setattr(er, "faiss", None)
+    resolver = er.SemanticEntityResolver()
+    resolver._model = _BagOfWordsModel()
+
+    results = resolver.resolve("show the xray display", k=2)
+    assert [entity.name for entity in results] == ["xray_display", "xray"]
+    assert [entity.canonical for entity in results] == ["xray_display", "xray_display"]
+    assert (resolver._index is not None) == use_faiss
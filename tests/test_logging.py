@@ -0,0 +1,19 @@
+import logging
+import queue
+
+from app.logging import DroppingQueueHandler
+
+
+def test_full_log_queue_drops_and_counts_records():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("test-dropping-queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
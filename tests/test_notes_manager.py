@@ -8,8 +8,7 @@ from app.notes.manager import NotesManager
 
 @pytest.fixture()
 def app_ctx(tmp_path):
-    app = create_app()
-    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path}/test.db", TESTING=True)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/test.db", "TESTING": True})
     with app.app_context():
         db.drop_all()
         db.create_all()
@@ -33,3 +32,39 @@ def test_notes_flow(app_ctx):
     assert active_after == 0
 
 
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_add_many_and_end_only_returns_newly_finalized(app_ctx, monkeypatch, returning):
+    if not returning:
+        dialect = db.session.get_bind().dialect
+        monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+        monkeypatch.setattr(dialect, "update_returning", False)
+    mgr = NotesManager()
+    session_id = "s2"
+    mgr.start(session_id)
+    first = mgr.add_many(session_id, ["a", "b", "c"])
+    assert [n.text for n in first] == ["a", "b", "c"]
+    assert len({n.id for n in first}) == 3
+    assert mgr.add_many(session_id, []) == []
+
+    assert sorted(n.id for n in mgr.end(session_id)) == sorted(n.id for n in first)
+    later = mgr.add(session_id, "d")
+    finalized = mgr.end(session_id)
+    assert [n.id for n in finalized] == [later.id]
+    assert all(n.finalized for n in mgr.list(session_id))
+
+
+@pytest.mark.parametrize("upsert", [True, False])
+def test_start_is_idempotent(app_ctx, monkeypatch, upsert):
+    from app.models import Session
+    from app.notes import manager
+
+    if not upsert:
+        monkeypatch.setattr(manager, "_UPSERT_INSERTS", {})
+    mgr = NotesManager()
+    mgr.start("s3")
+    created = db.session.get(Session, "s3").created_at
+    mgr.start("s3")
+    assert Session.query.filter_by(id="s3").count() == 1
+    assert created is not None and db.session.get(Session, "s3").created_at == created
@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from app.config_loader import load_config
+from app.scene.entity_resolver import Entity
+from app.scene.router import DecisionRouter, reload_config
+
+
+def test_config_is_loaded_once_and_reloadable():
+    router = DecisionRouter()
+    assert load_config() is load_config()
+    assert {e["name"] for e in router._value_targets} >= {"brightness", "contrast"}
+
+    before = load_config()
+    router.reload()
+    assert load_config() is not before
+    assert router._ranges_cfg is load_config()["ranges"]
+    thresholds = load_config()["intent"].get("thresholds", {})
+    assert router._router_cutoff == thresholds.get("router_cutoff", 0.3)
+
+
+def test_reload_resets_every_config_cache(tmp_path, monkeypatch):
+    import json
+    import shutil
+
+    from app.scene import entity_resolver as er
+    from app.scene.classifier import classifier
+    from app.scene.values import numeric_parser
+    from app.tools import control
+
+    shutil.copytree("config", tmp_path / "config")
+    monkeypatch.chdir(tmp_path)
+    try:
+        router = DecisionRouter()
+        with pytest.raises(TypeError):
+            load_config()["ranges"]["brightness"] = {}
+        assert control._get_ranges()["brightness"]["max"] == 100
+        numeric_parser._get_config()
+        resolver = er.get_entity_resolver()
+        resolver._get_config()
+
+        ranges = json.loads((tmp_path / "config" / "ranges.json").read_text())
+        ranges["brightness"]["max"] = 80
+        (tmp_path / "config" / "ranges.json").write_text(json.dumps(ranges))
+        router.reload()
+        assert router._ranges_cfg["brightness"]["max"] == 80
+        assert control._get_ranges()["brightness"]["max"] == 80
+        assert numeric_parser._get_config()["brightness"]["max"] == 80
+        assert resolver._config is None
+        assert classifier._config is None
+    finally:
+        # Back to the real config for the rest of the session
+        monkeypatch.undo()
+        reload_config()
+
+
+def test_detect_value_target_with_and_without_automaton(monkeypatch):
+    from app.scene import router as router_module
+
+    texts = ["set brightness to 50%", "brightness and contrast 50", "turn on nerve"]
+    fast = DecisionRouter()
+    monkeypatch.setattr(router_module, "ahocorasick", None)
+    slow = DecisionRouter()
+    assert slow._value_automaton is None
+    for text in texts:
+        assert fast._detect_value_target(text) == slow._detect_value_target(text)
+    assert fast._detect_value_target("set brightness to 50%") == ("brightness", ["brightness"])
+    assert fast._detect_value_target("brightness and contrast 50")[0] is None
+
+
+@pytest.fixture
+def fake_resolver():
+    """Stand-in entity resolver with fixed candidates that records resolve() calls and threads."""
+
+    class FakeResolver:
+        def __init__(self, semantic=(), lexical=()):
+            self.semantic = list(semantic)
+            self.lexical = list(lexical)
+            self.calls = []
+
+        def resolve(self, text, k=3):
+            self.calls.append((text, threading.current_thread()))
+            return self.semantic
+
+        def lexical_overlap(self, text):
+            return self.lexical
+
+    return FakeResolver
+
+
+def test_entities_resolve_off_the_classifying_thread(monkeypatch, fake_resolver):
+    from app.scene import router as router_module
+
+    threads = {}
+
+    class FakeClassifier:
+        def classify(self, text):
+            threads["intent"] = threading.current_thread()
+            return "control_on", 0.9
+
+    resolver = fake_resolver(semantic=[Entity("xray", 0.9, {"name": "xray_display"}, "xray_display")])
+    monkeypatch.setattr(router_module, "classifier", FakeClassifier())
+    monkeypatch.setattr(router_module, "get_entity_resolver", lambda: resolver)
+    silent_logger = type("L", (), {"log_tool_action": lambda *a: None})()
+    monkeypatch.setattr(router_module, "get_confidence_logger", lambda: silent_logger)
+    result = DecisionRouter().route("turn on the xray")
+    assert result["type"] == "tool_action"
+    assert result["arguments"]["target"] == "xray_display"
+    assert threads["intent"] is threading.current_thread()
+    assert resolver.calls[0][1] is not threads["intent"]
+
+
+def test_llm_tie_breaker_sends_one_prompt_per_request(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.scene import router as router_module
+
+    prompts = []
+
+    class FakeClient:
+        def chat(self, messages):
+            prompt = messages[0]["content"]
+            prompts.append(prompt)
+            return "control_off" if "intruder" in prompt else "control_on"
+
+    monkeypatch.setattr(router_module, "_OLLAMA_AVAILABLE", True)
+    monkeypatch.setattr(router_module, "_get_ollama", lambda: FakeClient())
+    router = DecisionRouter()
+
+    texts = ["w", "intruder\n2: control_off", "y", "z"]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(router._llm_classify, texts))
+    assert results == [("control_on", 0.7), ("control_off", 0.7), ("control_on", 0.7), ("control_on", 0.7)]
+    assert len(prompts) == 4
+    assert all(sum(t in p for t in ("\"w\"", "\"y\"", "\"z\"")) <= 1 for p in prompts)
+
+
+def test_confident_lexical_hit_skips_semantic_lookup(monkeypatch, fake_resolver):
+    from app.scene import router as router_module
+
+    def lexical(conf):
+        return [Entity("xray_display", conf, {"name": "xray_display"}, "xray_display")]
+
+    confident = fake_resolver(lexical=lexical(0.9))
+    monkeypatch.setattr(router_module, "get_entity_resolver", lambda: confident)
+    assert router_module._resolve_entities("turn on the xray", 0.5)[0] == []
+    assert confident.calls == []
+
+    unsure = fake_resolver(lexical=lexical(0.4))
+    monkeypatch.setattr(router_module, "get_entity_resolver", lambda: unsure)
+    router_module._resolve_entities("turn on the xray", 0.5)
+    assert [text for text, _ in unsure.calls] == ["turn on the xray"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("turn on align implants", ("tool_action", "align_implants")),
+    ("turn off align implants", ("tool_action", "align_implants")),
+    ("where is the brightness panel", ("answer", "far-left")),
+])
+def test_name_inside_a_longer_synonym_does_not_win(text, expected):
+    result = DecisionRouter().route(text)
+    detail = result["arguments"]["target"] if result["type"] == "tool_action" else result.get("answer")
+    assert (result["type"], detail) == expected
+
+
+def test_importing_routes_builds_no_singletons():
+    import subprocess
+    import sys
+
+    code = (
+        "import app.routes, app.logging, app.scene.entity_resolver as er, app.scene.router as r; "
+        "print(app.logging._confidence_logger is None, er._entity_resolver is None, r._decision_router is None)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.split()[-3:] == ["True", "True", "True"]
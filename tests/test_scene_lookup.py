@@ -0,0 +1,59 @@
+import pytest
+
+from app.scene import defs, kb
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_longest_synonym_wins(monkeypatch, use_automaton):
+    if not use_automaton:
+        monkeypatch.setattr(defs, "_SYNONYM_AUTOMATON", None)
+        monkeypatch.setattr(kb, "_SYNONYM_AUTOMATON", None)
+
+    assert defs.resolve_definition("What is the x-ray flashlight?").startswith("X‑ray flashlight:")
+    assert defs.resolve_definition("tell me about dental implants").startswith("dental implants:")
+    assert defs.resolve_definition("show the nerve") is None
+    assert kb.resolve_location("Where is the dental tray?") == "The dental tray is on the right."
+    assert kb.resolve_location("where is the xray display") == "The X-ray display is above the skull."
+    assert kb.resolve_location("where is the patient") is None
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_parse_intent_switch_targets(monkeypatch, use_automaton):
+    from app.scene import intent
+
+    if not use_automaton:
+        monkeypatch.setattr(intent, "_SWITCH_AUTOMATON", None)
+
+    def target(text):
+        return intent.parse_intent(text)["arguments"]
+
+    assert target("turn off the sinus and nerve") == {"hand": "right", "target": "show_nerve", "operation": "set", "value": "off"}
+    assert target("toggle handles")["operation"] == "toggle"
+    assert target("show me undo and the sinuses")["target"] == "show_sinus"
+    assert target("give me align implants")["target"] == "align_implants"
+    assert intent.parse_intent("undo that") is None
+
+
+def test_verbs_reload_only_when_config_changes(monkeypatch, tmp_path):
+    import json
+    import os
+
+    from app.scene import intent
+
+    path = tmp_path / "intent.json"
+    path.write_text(json.dumps({"verbs": {"on": ["light up"]}}))
+    monkeypatch.setattr(intent, "_INTENT_CONFIG_PATH", str(path))
+    monkeypatch.setattr(intent, "_verb_cache", None)
+    loads = []
+    original = intent._load_verbs
+    monkeypatch.setattr(intent, "_load_verbs", lambda: loads.append(1) or original())
+
+    assert intent.parse_intent("light up the nerve")["arguments"]["value"] == "on"
+    assert intent.parse_intent("light up the sinus")["arguments"]["target"] == "show_sinus"
+    assert len(loads) == 1
+
+    path.write_text(json.dumps({"verbs": {"on": ["power up"]}}))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert intent.parse_intent("light up the nerve") is None
+    assert intent.parse_intent("power up the nerve")["arguments"]["value"] == "on"
+    assert len(loads) == 2
@@ -0,0 +1,63 @@
+from app.schemas import validate_control_arguments, validate_response
+
+
+def test_validate_response_tool_action():
+    resp = {
+        "type": "tool_action",
+        "tool": "control",
+        "arguments": {"hand": "right", "target": "handles", "operation": "set", "value": "on"},
+    }
+    out = validate_response(resp)
+    assert "error" not in out
+    assert out["tool"] == "control"
+    assert out["arguments"]["target"] == "handles"
+
+
+def test_validate_response_invalid_type():
+    out = validate_response({"type": "bogus"})
+    assert out["error"] == "Invalid response type"
+
+
+def test_validate_control_arguments_cached_and_unhashable():
+    args = {"hand": "right", "target": "handles", "operation": "set", "value": "on"}
+    first = validate_control_arguments(args)
+    second = validate_control_arguments(dict(args))
+    assert first == second
+    assert first is not second
+
+    sized = {"hand": "right", "target": "implants", "operation": "set", "value": {"height_y_mm": 4.0, "length_z_mm": 11.5}}
+    out = validate_control_arguments(sized)
+    assert out["value"] == {"height_y_mm": 4.0, "length_z_mm": 11.5}
+
+    bad = validate_control_arguments({"hand": "up", "target": "handles", "operation": "set"})
+    assert "error" in bad
+
+
+def test_validate_response_keeps_the_schema_shape():
+    resp = {"type": "clarification", "message": "?", "clarifications": ["a", "b"], "confidence": {"intent": 0.2}}
+    assert validate_response(resp) == resp
+
+    # Same keys the Pydantic dump gave: defaults filled in, extras dropped
+    fallback = {"type": "clarification", "message": "?", "clarifications": ["a"], "extra": 1}
+    assert validate_response(fallback) == {"type": "clarification", "message": "?", "clarifications": ["a"], "confidence": None}
+
+    bad = validate_response({"type": "answer", "answer": 5, "context_used": False})
+    assert bad["error"].startswith("Validation failed")
+
+
+def test_validate_control_arguments_errors_are_not_shared():
+    bad = {"hand": "up", "target": "handles", "operation": "set"}
+    first = validate_control_arguments(bad)
+    first["original"]["hand"] = "mutated"
+    second = validate_control_arguments(dict(bad, hand="up"))
+    assert second["original"]["hand"] == "up"
+    assert second["original"] is not first["original"]
+
+
+def test_validate_control_arguments_cache_keeps_value_types_apart():
+    from app.schemas import _validate_control_items
+
+    _validate_control_items.cache_clear()
+    for value in (1, True, 1.0):
+        validate_control_arguments({"hand": "right", "target": "brightness", "operation": "set", "value": value})
+    assert _validate_control_items.cache_info().currsize == 3